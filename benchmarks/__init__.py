@@ -0,0 +1,6 @@
+"""Offline performance benchmarks for the machine learning lessons.
+
+Run an individual benchmark with ``python -m benchmarks.<name>`` from the
+repository root. All benchmarks use synthetic or bundled data so they work
+without network access.
+"""
@@ -0,0 +1,82 @@
+"""Benchmark the election candidates loader against the original cs253 parsing.
+
+``train.csv`` is replicated until it has ``--rows`` rows and written to a
+temporary file. The legacy path reads every column and runs the chained
+``str.replace`` / ``pd.to_numeric`` sequence per money column; the new path is
+``election_data.load_candidates``.
+
+Usage::
+
+    python -m benchmarks.election_loader --rows 2000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from election_data import MONEY_COLUMNS, load_candidates
+
+TRAIN_CSV = Path(__file__).resolve().parent.parent / "train.csv"
+
+
+def legacy_load(path: Path) -> pd.DataFrame:
+    """The parsing sequence ``cs253.py`` originally used."""
+
+    frame = pd.read_csv(path)
+    for column in MONEY_COLUMNS:
+        frame[column] = (
+            frame[column]
+            .str.replace(" Crore+", "e+7")
+            .str.replace(" Lac+", "e+5")
+            .str.replace(" Thou+", "e+3")
+            .str.replace(" Hund+", "e+2")
+        )
+        frame[column] = pd.to_numeric(frame[column])
+    return frame
+
+
+def replicate_csv(source: Path, n_rows: int, destination: Path) -> None:
+    frame = pd.read_csv(source)
+    repeats = -(-n_rows // len(frame))
+    replicated = pd.concat([frame] * repeats, ignore_index=True).iloc[:n_rows]
+    replicated["ID"] = np.arange(n_rows)
+    replicated.to_csv(destination, index=False)
+
+
+def time_loader(loader, path: Path) -> tuple[float, pd.DataFrame]:
+    start = time.perf_counter()
+    frame = loader(path)
+    return time.perf_counter() - start, frame
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "train_replicated.csv"
+        replicate_csv(TRAIN_CSV, args.rows, path)
+
+        legacy_seconds, legacy = time_loader(legacy_load, path)
+        fast_seconds, fast = time_loader(load_candidates, path)
+
+    for column in MONEY_COLUMNS:
+        if not np.array_equal(legacy[column].to_numpy(), fast[column].to_numpy()):
+            raise AssertionError(f"{column} differs between loaders")
+
+    print(f"rows: {args.rows:,}")
+    for name, seconds, frame in (("legacy", legacy_seconds, legacy), ("election_data", fast_seconds, fast)):
+        megabytes = frame.memory_usage(deep=True).sum() / 1e6
+        print(f"{name:<14} {seconds:8.3f} s {megabytes:10.1f} MB")
+    print(f"speed-up: {legacy_seconds / fast_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Time and memory-profile the lesson hot paths against stored baselines.
+
+Every case is set up on synthetic data of ``--sizes`` rows (no network, no
+bundled datasets) and then timed as the best of ``--repeat`` calls after one
+warm-up call. A separate call runs under ``tracemalloc`` to record the peak
+traced allocation. Results are keyed ``"<case>[<size>]"`` and compared with
+``benchmarks/hot_path_baselines.json``.
+
+Wall-clock baselines only mean something on the machine that recorded them,
+so every run also times a fixed NumPy-plus-interpreter calibration workload
+and scales the baseline seconds by the ratio of this run's calibration time
+to the one stored with the baselines. A case regresses when its time or peak
+memory exceeds the (scaled) baseline by more than ``--threshold``, plus an
+absolute allowance of 5 ms and 1 MB so the smallest cases do not trip on
+scheduler and allocator noise. Any regression makes the run exit non-zero.
+
+``--update`` records the current results and calibration as the new
+baselines. Scaling absorbs uniform speed differences, not different CPU
+architectures or BLAS builds, so run ``--update`` on the CI machine (or one
+like it) that will check against the file.
+
+Cases:
+
+- ``nn_train_step``: ``SimpleNeuralNetwork.train_step`` on one full batch.
+- ``service_predict``: ``ModelService.predict``, one call per row.
+- ``service_predict_batch``: ``ModelService.predict_batch`` on all rows.
+- ``feature_pipeline``: ``FeaturePipelineBuilder.build().fit_transform``.
+- ``engineer_features``: lesson02 ``engineer_features``.
+- ``perform_clustering``: lesson07 k-means plus silhouette.
+- ``cross_validation``: lesson05 ``evaluate_with_cross_validation``.
+- ``cs253_preprocessing``: ``load_candidates`` plus the ``cs253`` feature
+  ``ColumnTransformer`` on a generated candidates CSV.
+
+Usage::
+
+    python -m benchmarks.hot_paths
+    python -m benchmarks.hot_paths --cases nn_train_step perform_clustering --sizes 1000 100000
+    python -m benchmarks.hot_paths --update
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.preprocessing_memory import synthetic_frame
+from lessons.lesson02_numpy_pandas import engineer_features
+from lessons.lesson05_model_evaluation import evaluate_with_cross_validation
+from lessons.lesson06_feature_engineering import FeaturePipelineBuilder
+from lessons.lesson07_unsupervised_learning import perform_clustering
+from lessons.lesson08_deep_learning import SimpleNeuralNetwork
+from lessons.lesson09_model_deployment import ModelService, ModelTrainer
+
+BASELINE_PATH = Path(__file__).with_name("hot_path_baselines.json")
+DEFAULT_SIZES = (1_000, 10_000)
+TIME_SLACK_SECONDS = 0.005
+MEMORY_SLACK_MB = 1.0
+
+# A case maps a row count and a scratch directory to the zero-argument call to time.
+Case = Callable[[int, Path], Callable[[], object]]
+
+
+def _regression_data(rows: int, features: int = 10, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, features))
+    y = X @ rng.normal(size=features) + rng.normal(scale=0.1, size=rows)
+    return X, y
+
+
+def nn_train_step(rows: int, scratch: Path) -> Callable[[], object]:
+    X, y = _regression_data(rows, features=32)
+    network = SimpleNeuralNetwork(input_dim=32, hidden_dim=64, output_dim=1)
+    targets = y.reshape(-1, 1)
+    return lambda: network.train_step(X, targets)
+
+
+def _service(scratch: Path) -> ModelService:
+    model_path = scratch / "service.joblib"
+    if not model_path.exists():
+        X, y = _regression_data(1_000)
+        ModelTrainer(model_path).train_and_save(X, y)
+    return ModelService(model_path)
+
+
+def service_predict(rows: int, scratch: Path) -> Callable[[], object]:
+    service = _service(scratch)
+    requests = _regression_data(rows)[0].tolist()
+    return lambda: [service.predict(features) for features in requests]
+
+
+def service_predict_batch(rows: int, scratch: Path) -> Callable[[], object]:
+    service = _service(scratch)
+    requests = _regression_data(rows)[0].tolist()
+    return lambda: service.predict_batch(requests)
+
+
+def feature_pipeline(rows: int, scratch: Path) -> Callable[[], object]:
+    frame = synthetic_frame(rows, numeric=10, categorical=3, cardinality=50)
+    builder = FeaturePipelineBuilder(
+        numeric_features=[f"num{i}" for i in range(10)],
+        categorical_features=[f"cat{i}" for i in range(3)],
+        text_feature="text",
+    )
+    return lambda: builder.build().fit_transform(frame)
+
+
+def engineer_features_case(rows: int, scratch: Path) -> Callable[[], object]:
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({"price": rng.lognormal(11, 0.4, rows), "rooms": rng.integers(1, 8, rows)})
+    return lambda: engineer_features(frame)
+
+
+def perform_clustering_case(rows: int, scratch: Path) -> Callable[[], object]:
+    rng = np.random.default_rng(0)
+    centres = rng.normal(scale=5.0, size=(3, 8))
+    data = centres[rng.integers(0, 3, rows)] + rng.normal(size=(rows, 8))
+    # The exact silhouette is quadratic in the rows; larger sizes score a sample.
+    sample = None if rows <= 10_000 else 10_000
+    return lambda: perform_clustering(k=3, data=data, silhouette_sample=sample)
+
+
+def cross_validation(rows: int, scratch: Path) -> Callable[[], object]:
+    X, y = _regression_data(rows)
+    return lambda: evaluate_with_cross_validation(X, y)
+
+
+def synthetic_candidates_csv(path: Path, rows: int, seed: int = 0) -> Path:
+    """Write ``rows`` made-up candidates in the layout of the election ``train.csv``."""
+
+    from election_data import EDUCATION_LEVELS
+
+    rng = np.random.default_rng(seed)
+    amounts = [f"{value} {unit}" for value in range(1, 100) for unit in ("Crore+", "Lac+", "Thou+", "Hund+")] + ["0"]
+    frame = pd.DataFrame(
+        {
+            "ID": np.arange(rows),
+            "Candidate": [f"Candidate {i}" for i in range(rows)],
+            "Constituency ∇": [f"SEAT {i}" for i in rng.integers(0, 500, rows)],
+            "Party": np.array([f"PARTY{i}" for i in range(20)])[rng.integers(0, 20, rows)],
+            "Criminal Case": rng.poisson(1.0, rows),
+            "Total Assets": np.array(amounts)[rng.integers(0, len(amounts), rows)],
+            "Liabilities": np.array(amounts)[rng.integers(0, len(amounts), rows)],
+            "state": np.array([f"STATE{i}" for i in range(28)])[rng.integers(0, 28, rows)],
+            "Education": np.array(list(EDUCATION_LEVELS))[rng.integers(0, len(EDUCATION_LEVELS), rows)],
+        }
+    )
+    frame.to_csv(path, index=False)
+    return path
+
+
+def cs253_preprocessing(rows: int, scratch: Path) -> Callable[[], object]:
+    import cs253
+    from election_data import load_candidates
+
+    path = synthetic_candidates_csv(scratch / f"candidates_{rows}.csv", rows)
+
+    def run() -> object:
+        frame = load_candidates(path)
+        return cs253.build_pipeline().named_steps["features"].fit_transform(frame)
+
+    return run
+
+
+CASES: dict[str, Case] = {
+    "nn_train_step": nn_train_step,
+    "service_predict": service_predict,
+    "service_predict_batch": service_predict_batch,
+    "feature_pipeline": feature_pipeline,
+    "engineer_features": engineer_features_case,
+    "perform_clustering": perform_clustering_case,
+    "cross_validation": cross_validation,
+    "cs253_preprocessing": cs253_preprocessing,
+}
+
+
+def calibration_workload() -> Callable[[], object]:
+    """Fixed mix of BLAS/LAPACK and pure-Python work used to rescale baseline times."""
+
+    matrix = np.random.default_rng(0).normal(size=(300, 300))
+    values = list(range(200_000))
+
+    def run() -> object:
+        np.linalg.eigh(matrix @ matrix.T)
+        return sum(value * value for value in values)
+
+    return run
+
+
+def best_seconds(call: Callable[[], object], repeat: int) -> float:
+    """Fastest of ``repeat`` timed calls of ``call``, after one warm-up call."""
+
+    call()
+    seconds = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        seconds = min(seconds, time.perf_counter() - start)
+    return seconds
+
+
+def measure(call: Callable[[], object], repeat: int = 7) -> dict[str, float]:
+    """Best-of-``repeat`` seconds and ``tracemalloc`` peak MB of ``call``."""
+
+    seconds = best_seconds(call, repeat)
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": seconds, "peak_mb": peak / 2**20}
+
+
+def regressions(
+    result: dict[str, float], baseline: dict[str, float], threshold: float, speed: float = 1.0
+) -> list[str]:
+    """Metrics of ``result`` that are more than ``threshold`` worse than ``baseline``.
+
+    ``speed`` is this run's calibration time over the baselines' one; baseline
+    seconds are scaled by it before comparing.
+    """
+
+    worse = []
+    if result["seconds"] > baseline["seconds"] * speed * (1 + threshold) + TIME_SLACK_SECONDS:
+        worse.append("seconds")
+    if result["peak_mb"] > baseline["peak_mb"] * (1 + threshold) + MEMORY_SLACK_MB:
+        worse.append("peak_mb")
+    return worse
+
+
+def load_baselines(path: Path = BASELINE_PATH) -> tuple[float | None, dict[str, dict[str, float]]]:
+    """``(calibration seconds, per-case baselines)`` stored in ``path``."""
+
+    if not path.exists():
+        return None, {}
+    stored = json.loads(path.read_text())
+    return stored["calibration_seconds"], stored["cases"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", nargs="*", choices=sorted(CASES), help="cases to run (default: all)")
+    parser.add_argument("--sizes", nargs="*", type=int, default=list(DEFAULT_SIZES), help="rows per case")
+    parser.add_argument("--repeat", type=int, default=7, help="timed calls per case; the fastest counts")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown / memory growth")
+    parser.add_argument("--baseline-file", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update", action="store_true", help="store this run's results as the baselines")
+    args = parser.parse_args()
+
+    base_calibration, baselines = load_baselines(args.baseline_file)
+    calibration = best_seconds(calibration_workload(), args.repeat)
+    speed = calibration / base_calibration if base_calibration else 1.0
+    print(f"calibration: {calibration:.4f} s ({speed:.2f}x the baseline machine's time)")
+    failures = []
+    print(f"{'case':<34} {'seconds':>9} {'base':>9} {'peak MB':>9} {'base':>9}")
+    with tempfile.TemporaryDirectory() as scratch:
+        for name in args.cases or CASES:
+            for rows in args.sizes:
+                key = f"{name}[{rows}]"
+                result = measure(CASES[name](rows, Path(scratch)), args.repeat)
+                baseline = baselines.get(key)
+                worse = regressions(result, baseline, args.threshold, speed) if baseline else []
+                base_seconds = f"{baseline['seconds'] * speed:9.4f}" if baseline else f"{'-':>9}"
+                base_peak = f"{baseline['peak_mb']:9.1f}" if baseline else f"{'-':>9}"
+                flag = f"  REGRESSED ({', '.join(worse)})" if worse else ""
+                print(f"{key:<34} {result['seconds']:9.4f} {base_seconds} {result['peak_mb']:9.1f} {base_peak}{flag}")
+                if worse:
+                    failures.append(key)
+                if args.update:
+                    baselines[key] = {metric: round(value, 6) for metric, value in result.items()}
+
+    if args.update:
+        stored = {"calibration_seconds": round(calibration, 6), "cases": dict(sorted(baselines.items()))}
+        args.baseline_file.write_text(json.dumps(stored, indent=2) + "\n")
+        print(f"baselines written to {args.baseline_file}")
+    elif failures:
+        print(f"{len(failures)} case(s) regressed by more than {args.threshold:.0%}: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
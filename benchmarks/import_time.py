@@ -0,0 +1,126 @@
+"""Import-time budgets for the lesson modules.
+
+Each module is imported in a fresh interpreter under ``python -X importtime``
+and its cumulative import time is compared with the budget recorded in
+``benchmarks/import_budget.json``. The lesson modules defer pandas,
+scikit-learn and joblib through ``lessons._lazy.lazy_import``, so an eager
+import sneaking back in shows up here as a jump of a second or more. The
+heaviest packages pulled in by an over-budget module are listed to point at
+the culprit.
+
+The exit status is non-zero when any module exceeds its budget. After an
+intentional change, rewrite the budgets from the current timings (with
+``--headroom`` slack for machine noise) using ``--update``.
+
+Usage::
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --modules lessons.lesson05_model_evaluation --repeat 5
+    python -m benchmarks.import_time --update --headroom 1.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_PATH = Path(__file__).with_name("import_budget.json")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def import_profile(module: str) -> list[tuple[int, str, int]]:
+    """``(depth, name, cumulative µs)`` for every import triggered by ``import module``."""
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = []
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            profile.append((len(match.group(3)) // 2, match.group(4), int(match.group(2))))
+    return profile
+
+
+def import_time_ms(module: str, repeat: int = 3) -> tuple[float, list[tuple[int, str, int]]]:
+    """Best-of-``repeat`` cumulative import time of ``module`` in milliseconds, plus its profile."""
+
+    best, best_profile = math.inf, []
+    for _ in range(repeat):
+        profile = import_profile(module)
+        micros = next(cumulative for _, name, cumulative in profile if name == module)
+        if micros < best:
+            best, best_profile = micros, profile
+    return best / 1000, best_profile
+
+
+def heaviest_packages(profile: list[tuple[int, str, int]], module: str, top: int = 5) -> list[tuple[str, float]]:
+    """Largest third-party top-level packages imported on behalf of ``module``."""
+
+    # Entries are logged after their children complete, so everything from the
+    # end of the previous top-level entry up to ``module`` belongs to it.
+    end = next(index for index, (_, name, _) in enumerate(profile) if name == module)
+    start = max((index + 1 for index, (depth, _, _) in enumerate(profile[:end]) if depth == 0), default=0)
+    packages: dict[str, float] = {}
+    for _, name, cumulative in profile[start:end]:
+        root = name.split(".")[0]
+        if "." not in name and root not in sys.stdlib_module_names and root != "lessons":
+            packages[root] = max(packages.get(root, 0.0), cumulative / 1000)
+    return sorted(packages.items(), key=lambda item: -item[1])[:top]
+
+
+def load_budgets(path: Path = BUDGET_PATH) -> dict[str, float]:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="*", help="modules to time (default: every module in the budget file)")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per module; the fastest counts")
+    parser.add_argument("--budget-file", type=Path, default=BUDGET_PATH)
+    parser.add_argument("--update", action="store_true", help="rewrite the budgets from the measured times")
+    parser.add_argument("--headroom", type=float, default=1.5, help="budget = measured ms x headroom (with --update)")
+    args = parser.parse_args()
+
+    budgets = load_budgets(args.budget_file)
+    modules = args.modules or sorted(budgets)
+    if not modules:
+        parser.error(f"no modules given and no budgets in {args.budget_file}")
+
+    print(f"{'module':<42} {'ms':>8} {'budget':>8}")
+    failures = []
+    for module in modules:
+        ms, profile = import_time_ms(module, args.repeat)
+        budget = budgets.get(module)
+        over = budget is not None and ms > budget
+        flag = "  OVER" if over else ""
+        print(f"{module:<42} {ms:8.1f} {budget if budget is not None else '-':>8}{flag}")
+        if over:
+            failures.append(module)
+            heavy = ", ".join(f"{name} {package_ms:.0f} ms" for name, package_ms in heaviest_packages(profile, module))
+            print(f"    heaviest packages: {heavy or 'none'}")
+        if args.update:
+            # Round up to 10 ms so tiny modules are not at the mercy of scheduler noise.
+            budgets[module] = max(10, math.ceil(ms * args.headroom / 10) * 10)
+
+    if args.update:
+        args.budget_file.write_text(json.dumps(dict(sorted(budgets.items())), indent=2) + "\n")
+        print(f"budgets written to {args.budget_file}")
+    elif failures:
+        print(f"{len(failures)} module(s) over their import-time budget: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
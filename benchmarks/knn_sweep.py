@@ -0,0 +1,51 @@
+"""Time the cs253 ``n_neighbors`` search: GridSearchCV vs the single-query sweep.
+
+Both search k = 1..31 with 5-fold CV over the full cs253 pipeline. A single
+pipeline fit is timed as the reference cost.
+
+Usage::
+
+    python -m benchmarks.knn_sweep
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.model_selection import GridSearchCV
+
+import cs253
+from election_data import load_candidates
+from knn_search import sweep_n_neighbors
+
+TRAIN_CSV = Path(__file__).resolve().parent.parent / "train.csv"
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    frame = load_candidates(TRAIN_CSV)
+    y = frame["Education"].map(cs253.education_mapping).astype("int64")
+    k_values = list(cs253.N_NEIGHBORS_RANGE)
+
+    fit_seconds, _ = timed(lambda: cs253.build_pipeline().fit(frame, y))
+    grid_seconds, grid = timed(
+        lambda: GridSearchCV(cs253.build_pipeline(), {"knn__n_neighbors": k_values}, cv=5, n_jobs=-1).fit(frame, y)
+    )
+    sweep_seconds, sweep = timed(lambda: sweep_n_neighbors(cs253.build_pipeline(), frame, y, k_values, cv=5))
+
+    score_gap = np.abs(sweep.mean_scores - grid.cv_results_["mean_test_score"]).max()
+    print(f"single fit       {fit_seconds:8.3f} s")
+    print(f"GridSearchCV     {grid_seconds:8.3f} s  best k={grid.best_params_['knn__n_neighbors']}")
+    print(f"sweep_n_neighbors{sweep_seconds:8.3f} s  best k={sweep.best_k}")
+    print(f"max CV score difference (distance ties): {score_gap:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare exhaustive and successive-halving search for the lesson04 forests.
+
+Runs both search modes of ``lessons.lesson04_supervised_learning.build_search``
+on ``load_wine`` (classification) and ``load_diabetes`` (an offline regression
+dataset bundled with scikit-learn) and reports wall-clock time, the chosen
+parameters and the held-out score. The grid search cache is disabled so every
+run does the full amount of work. ``--extended`` adds a 72-candidate grid,
+which is where successive halving pays off most.
+
+Usage::
+
+    python -m benchmarks.lesson04_search_modes [--extended]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.datasets import load_diabetes, load_wine
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.metrics import accuracy_score, mean_squared_error
+from sklearn.model_selection import train_test_split
+
+from lessons.lesson04_supervised_learning import SEARCH_MODES, build_search
+
+
+def run_case(name, estimator, param_grid, data, metric, stratify: bool) -> None:
+    X_train, X_test, y_train, y_test = train_test_split(
+        data.data, data.target, test_size=0.2, random_state=42, stratify=data.target if stratify else None
+    )
+    print(f"\n{name}")
+    for mode in SEARCH_MODES:
+        search = build_search(estimator, param_grid, mode, cache_dir=None)
+        start = time.perf_counter()
+        search.fit(X_train, y_train)
+        seconds = time.perf_counter() - start
+        score = metric(y_test, search.predict(X_test))
+        print(f"  {mode:<8} {seconds:7.2f} s  test={score:.4f}  best={search.best_params_}")
+
+
+EXTENDED_GRID = {
+    "n_estimators": [50, 100, 200],
+    "max_depth": [None, 4, 8, 16],
+    "min_samples_leaf": [1, 2, 4],
+    "max_features": ["sqrt", 0.5],
+}
+
+
+def rmse(y_true, y_pred) -> float:
+    return float(np.sqrt(mean_squared_error(y_true, y_pred)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--extended", action="store_true", help="also run the 72-candidate grid")
+    args = parser.parse_args()
+
+    classifier = RandomForestClassifier(random_state=42)
+    regressor = RandomForestRegressor(random_state=42)
+    run_case("load_wine (accuracy)", classifier, {"n_estimators": [100, 200], "max_depth": [None, 8, 16]}, load_wine(), accuracy_score, True)
+    run_case("load_diabetes (RMSE)", regressor, {"n_estimators": [50, 100], "max_depth": [None, 8, 16]}, load_diabetes(), rmse, False)
+    if args.extended:
+        run_case("load_wine, extended grid (accuracy)", classifier, EXTENDED_GRID, load_wine(), accuracy_score, True)
+        run_case("load_diabetes, extended grid (RMSE)", regressor, EXTENDED_GRID, load_diabetes(), rmse, False)
+
+
+if __name__ == "__main__":
+    main()
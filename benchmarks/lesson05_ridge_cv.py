@@ -0,0 +1,66 @@
+"""Time Ridge alpha sweeps and learning curves: scikit-learn vs sufficient statistics.
+
+Compares ``cross_validate``/``learning_curve`` refits against
+``ridge_cross_validation``/``ridge_learning_curve`` from lesson05 on synthetic
+regression data and checks that both give the same scores.
+
+Usage::
+
+    python -m benchmarks.lesson05_ridge_cv --samples 200000 --features 50 --alphas 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.datasets import make_regression
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import KFold, cross_validate, learning_curve
+
+from lessons.lesson05_model_evaluation import ridge_cross_validation, ridge_learning_curve
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=200_000)
+    parser.add_argument("--features", type=int, default=50)
+    parser.add_argument("--alphas", type=int, default=30)
+    args = parser.parse_args()
+
+    X, y = make_regression(n_samples=args.samples, n_features=args.features, noise=10.0, random_state=0)
+    alphas = np.logspace(-3, 3, args.alphas)
+    cv = KFold(n_splits=5, shuffle=True, random_state=42)
+
+    start = time.perf_counter()
+    sklearn_rmse = [
+        -cross_validate(Ridge(alpha=alpha), X, y, cv=cv, scoring="neg_root_mean_squared_error")["test_score"].mean()
+        for alpha in alphas
+    ]
+    sklearn_sweep = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast_rmse = ridge_cross_validation(X, y, alphas, cv).groupby("alpha")["rmse"].mean().to_numpy()
+    fast_sweep = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sizes, train_scores, _ = learning_curve(
+        Ridge(alpha=1.0), X, y, cv=5, scoring="neg_root_mean_squared_error",
+        train_sizes=np.linspace(0.1, 1.0, 10), shuffle=True, random_state=42,
+    )
+    sklearn_curve = time.perf_counter() - start
+
+    start = time.perf_counter()
+    curve = ridge_learning_curve(X, y, train_sizes=np.linspace(0.1, 1.0, 10))
+    fast_curve = time.perf_counter() - start
+
+    assert np.allclose(sklearn_rmse, fast_rmse)
+    assert np.allclose(-train_scores.mean(axis=1), curve["train_rmse"])
+    print(f"data: {args.samples:,} x {args.features}")
+    print(f"alpha sweep ({args.alphas} alphas x 5 folds): sklearn {sklearn_sweep:7.3f} s   fast {fast_sweep:7.3f} s")
+    print(f"learning curve (10 points x 5 folds):    sklearn {sklearn_curve:7.3f} s   fast {fast_curve:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
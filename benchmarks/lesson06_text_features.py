@@ -0,0 +1,70 @@
+"""Throughput and memory of the lesson06 text branch: TF-IDF + length union vs hashing transformer.
+
+Generates synthetic product descriptions and times ``fit_transform`` of the
+``FeatureUnion(TfidfVectorizer, TextLengthTransformer)`` used by
+``FeaturePipelineBuilder.build()`` against ``HashingTextTransformer`` on one
+process and on all cores. A second call of each runs under ``tracemalloc``
+to record the peak traced allocation. ``--vocabulary`` sets the number of
+distinct terms; the hashing transformer's timing and memory should not
+depend on it.
+
+Usage::
+
+    python -m benchmarks.lesson06_text_features --documents 200000 --words 30
+    python -m benchmarks.lesson06_text_features --documents 20000 --vocabulary 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.pipeline import FeatureUnion
+
+from lessons.lesson06_feature_engineering import HashingTextTransformer, TextLengthTransformer
+
+
+def synthetic_documents(n_documents: int, mean_words: int, vocabulary_size: int = 20_000, seed: int = 0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"term{i}" for i in range(vocabulary_size)])
+    lengths = rng.poisson(mean_words, n_documents) + 1
+    # Zipf-distributed word choice gives a realistic long-tailed vocabulary.
+    words = vocabulary[np.minimum(rng.zipf(1.3, lengths.sum()), vocabulary_size) - 1]
+    return pd.Series([" ".join(doc) for doc in np.split(words, np.cumsum(lengths)[:-1])])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=200_000)
+    parser.add_argument("--words", type=int, default=30, help="mean words per document")
+    parser.add_argument("--vocabulary", type=int, default=20_000, help="distinct terms in the corpus")
+    args = parser.parse_args()
+
+    documents = synthetic_documents(args.documents, args.words, args.vocabulary)
+    candidates = {
+        "tfidf + length union": FeatureUnion([("tfidf", TfidfVectorizer(max_features=100)), ("length", TextLengthTransformer())]),
+        "hashing (1 process)": HashingTextTransformer(),
+        "hashing (all cores)": HashingTextTransformer(n_jobs=-1),
+    }
+
+    print(f"{args.documents:,} documents, ~{args.words} words each, {args.vocabulary:,} distinct terms")
+    for name, transformer in candidates.items():
+        start = time.perf_counter()
+        features = transformer.fit_transform(documents)
+        seconds = time.perf_counter() - start
+        tracemalloc.start()
+        transformer.fit_transform(documents)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{name:<22} {seconds:7.3f} s  {args.documents / seconds:>12,.0f} docs/s  "
+            f"peak {peak / 2**20:7.1f} MB  shape {features.shape}"
+        )
+
+
+if __name__ == "__main__":
+    main()
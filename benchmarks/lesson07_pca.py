@@ -0,0 +1,73 @@
+"""Compare the lesson07 PCA modes: exact vs randomized vs incremental.
+
+Builds a tall, wide, low-rank-plus-noise matrix and, for each mode, fits the
+top ``--components`` and projects every row into a preallocated float32
+array with ``project_into``. Reports wall time, peak traced memory
+(``tracemalloc`` sees every NumPy allocation) and the largest relative error
+of the explained variances against the exact PCA.
+
+Usage::
+
+    python -m benchmarks.lesson07_pca --rows 200000 --features 500 --components 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.decomposition import PCA
+
+from lessons.lesson07_unsupervised_learning import fit_incremental_pca, project_into
+
+
+def low_rank_matrix(rows: int, features: int, rank: int = 50, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    # Decaying spectrum so the leading components are well separated.
+    scales = 10.0 * 0.9 ** np.arange(rank)
+    X = (rng.normal(size=(rows, rank)) * scales) @ rng.normal(size=(rank, features))
+    X += rng.normal(size=(rows, features))
+    return X
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--features", type=int, default=500)
+    parser.add_argument("--components", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    X = low_rank_matrix(args.rows, args.features)
+    k = args.components
+    fitters = {
+        "exact": lambda: PCA(n_components=k, svd_solver="full").fit(X),
+        "randomized": lambda: PCA(n_components=k, svd_solver="randomized", random_state=42).fit(X),
+        "incremental": lambda: fit_incremental_pca(
+            (X[start : start + args.batch_size] for start in range(0, len(X), args.batch_size)), k
+        ),
+    }
+
+    print(f"data: {args.rows:,} x {args.features} ({X.nbytes / 2**20:,.0f} MB), top {k} components")
+    print(f"{'mode':<12} {'seconds':>8} {'peak MB':>9} {'max rel. EV error':>18}")
+    reference = None
+    for name, fit in fitters.items():
+        out = np.empty((len(X), k), dtype=np.float32)
+        tracemalloc.start()
+        start = time.perf_counter()
+        pca = fit()
+        project_into(pca, X, out, chunk_size=args.batch_size)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        if reference is None:
+            reference = pca.explained_variance_
+        error = np.max(np.abs(pca.explained_variance_ - reference) / reference)
+        print(f"{name:<12} {seconds:8.2f} {peak / 2**20:9.1f} {error:18.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare how quickly the lesson08 optimizers converge on the sine-wave task.
+
+Each optimizer trains an identically initialised ``SimpleNeuralNetwork`` with
+full-batch ``train_step`` calls until the loss drops below ``target_loss`` (or
+``max_steps`` is reached) and reports the steps and wall-clock time taken.
+
+Usage::
+
+    python -m benchmarks.optimizer_convergence --target-loss 0.3
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from lessons.lesson08_deep_learning import SGD, Adam, Momentum, Optimizer, SimpleNeuralNetwork, generate_sine_wave_data
+
+
+def steps_to_target(
+    optimizer: Optimizer,
+    X: np.ndarray,
+    y: np.ndarray,
+    target_loss: float,
+    max_steps: int,
+    seed: int = 0,
+) -> dict[str, float]:
+    """Train until ``target_loss`` is reached and report steps, time and final loss."""
+
+    np.random.seed(seed)
+    network = SimpleNeuralNetwork(input_dim=1, hidden_dim=32, output_dim=1, optimizer=optimizer)
+    start = time.perf_counter()
+    loss = float("inf")
+    steps = 0
+    while steps < max_steps and loss > target_loss:
+        loss = network.train_step(X, y)
+        steps += 1
+    return {
+        "steps": steps,
+        "seconds": time.perf_counter() - start,
+        "final_loss": loss,
+        "converged": loss <= target_loss,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=512)
+    parser.add_argument("--target-loss", type=float, default=0.3)
+    parser.add_argument("--max-steps", type=int, default=20_000)
+    args = parser.parse_args()
+
+    np.random.seed(42)
+    X, y = generate_sine_wave_data(args.samples)
+    optimizers: dict[str, Optimizer] = {
+        "sgd": SGD(learning_rate=0.05),
+        "momentum": Momentum(learning_rate=0.05, momentum=0.9),
+        "nesterov": Momentum(learning_rate=0.05, momentum=0.9, nesterov=True),
+        "adam": Adam(learning_rate=0.01),
+    }
+
+    print(f"{'optimizer':<10} {'steps':>7} {'seconds':>9} {'final loss':>11} converged")
+    for name, optimizer in optimizers.items():
+        result = steps_to_target(optimizer, X, y, args.target_loss, args.max_steps)
+        print(
+            f"{name:<10} {result['steps']:>7} {result['seconds']:>9.3f} "
+            f"{result['final_loss']:>11.4f} {result['converged']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Peak memory of the lesson06 preprocessor output modes on wide, high-cardinality data.
+
+Each mode runs in a fresh interpreter so ``ru_maxrss`` (peak resident set
+size) is not polluted by the others. The preprocessor is fitted on a small
+sample first; the reported growth is the peak RSS during ``transform`` of the
+full frame above the RSS measured just before it.
+
+Modes:
+
+- ``default``: ``ColumnTransformer`` with ``sparse_threshold=0.3``.
+- ``sparse``: ``output="sparse"``, always CSR.
+- ``sparse-float32``: ``transform_sparse`` in 10k-row chunks, float32 CSR.
+- ``float32-into``: ``transform_into`` a preallocated float32 matrix.
+
+Usage::
+
+    python -m benchmarks.preprocessing_memory --rows 100000 --numeric 150 --categorical 3 --cardinality 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from lessons.lesson06_feature_engineering import FeaturePipelineBuilder
+from lessons.preprocessing_output import transform_into, transform_sparse
+
+MODES = ("default", "sparse", "sparse-float32", "float32-into")
+
+
+def synthetic_frame(rows: int, numeric: int, categorical: int, cardinality: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    columns = {f"num{i}": rng.normal(size=rows) for i in range(numeric)}
+    for i in range(categorical):
+        columns[f"cat{i}"] = pd.Categorical.from_codes(rng.integers(0, cardinality, rows), [f"c{j}" for j in range(cardinality)])
+    words = np.array([f"w{j}" for j in range(500)])
+    columns["text"] = [" ".join(doc) for doc in words[rng.integers(0, 500, (rows, 4))]]
+    frame = pd.DataFrame(columns)
+    # A sprinkle of missing values so the imputers do some work.
+    frame.loc[rng.random(rows) < 0.01, "num0"] = np.nan
+    return frame
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def current_rss_mb() -> float:
+    with open("/proc/self/statm") as handle:
+        return int(handle.read().split()[1]) * resource.getpagesize() / 2**20
+
+
+def run_mode(args: argparse.Namespace) -> None:
+    frame = synthetic_frame(args.rows, args.numeric, args.categorical, args.cardinality)
+    builder = FeaturePipelineBuilder(
+        numeric_features=[f"num{i}" for i in range(args.numeric)],
+        categorical_features=[f"cat{i}" for i in range(args.categorical)],
+        text_feature="text",
+        output="default" if args.mode == "default" else "sparse",
+    )
+    preprocessor = builder.build().fit(frame.iloc[:10_000])
+
+    before = current_rss_mb()
+    start = time.perf_counter()
+    if args.mode == "float32-into":
+        result = transform_into(preprocessor, frame)
+    elif args.mode == "sparse-float32":
+        result = transform_sparse(preprocessor, frame)
+    else:
+        result = preprocessor.transform(frame)
+    seconds = time.perf_counter() - start
+
+    nbytes = (result.data.nbytes + result.indices.nbytes + result.indptr.nbytes) if sparse.issparse(result) else result.nbytes
+    kind = f"{type(result).__name__}[{result.dtype}]"
+    print(f"{args.mode:<14} {kind:<20} {nbytes / 2**20:9.1f} {peak_rss_mb() - before:12.1f} {peak_rss_mb():10.1f} {seconds:8.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--numeric", type=int, default=150)
+    parser.add_argument("--categorical", type=int, default=3)
+    parser.add_argument("--cardinality", type=int, default=100)
+    parser.add_argument("--mode", choices=MODES, help="run a single mode in this process")
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args)
+        return
+
+    print(f"{args.rows:,} rows, {args.numeric} numeric + {args.categorical} x {args.cardinality}-level categorical + text")
+    print(f"{'mode':<14} {'result':<20} {'size MB':>9} {'peak grow MB':>12} {'peak MB':>10} {'seconds':>8}")
+    for mode in MODES:
+        options = ["--rows", args.rows, "--numeric", args.numeric, "--categorical", args.categorical, "--cardinality", args.cardinality]
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.preprocessing_memory", "--mode", mode, *map(str, options)], check=True
+        )
+
+
+if __name__ == "__main__":
+    main()
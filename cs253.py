@@ -1,72 +1,187 @@
-import pandas as pd
-import numpy as np
-from sklearn.preprocessing import LabelEncoder, MinMaxScaler
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.model_selection import GridSearchCV
-# Read the training data
-train_df = pd.read_csv('/kaggle/input/shivam/train.csv')
-
-# Preprocessing
-label = LabelEncoder()
-train_df['Party'] = label.fit_transform(train_df['Party'])
-train_df['state'] = label.fit_transform(train_df['state'])
-train_df['Total Assets'] = train_df['Total Assets'].str.replace(' Crore+', 'e+7').str.replace(' Lac+', 'e+5').str.replace(' Thou+', 'e+3').str.replace(' Hund+', 'e+2')
-train_df['Liabilities'] = train_df['Liabilities'].str.replace(' Crore+', 'e+7').str.replace(' Lac+', 'e+5').str.replace(' Thou+', 'e+3').str.replace(' Hund+', 'e+2')
-train_df['Total Assets'] = pd.to_numeric(train_df['Total Assets'])
-train_df['Liabilities'] = pd.to_numeric(train_df['Liabilities'])
-
-education_mapping = {
-    'Doctorate': 10,'Post Graduate': 9,'Graduate Professional': 8,'Graduate': 7,'12th Pass': 6,'10th Pass': 5,'8th Pass': 4,'5th Pass': 3,'Literate': 2,'Others': 1
-}
-train_df['Education'] = train_df['Education'].replace(education_mapping)
-
-# Feature Engineering: Ratio of Liabilities to Assets
-train_df['Feature_engineering_promt'] = np.log((train_df['Liabilities'] + 1)/ (train_df['Total Assets'] + 1)) # Adding a small constant before division to avoid zero division
-
-# Read the test data
-test_df = pd.read_csv('/kaggle/input/shivam/test.csv')
-
-# Preprocess test data
-test_df['Party'] = label.transform(test_df['Party'])
-test_df['state'] = label.transform(test_df['state'])
-test_df['Total Assets'] = test_df['Total Assets'].str.replace(' Crore+', 'e+7').str.replace(' Lac+', 'e+5').str.replace(' Thou+', 'e+3').str.replace(' Hund+', 'e+2')
-test_df['Liabilities'] = test_df['Liabilities'].str.replace(' Crore+', 'e+7').str.replace(' Lac+', 'e+5').str.replace(' Thou+', 'e+3').str.replace(' Hund+', 'e+2')
-test_df['Total Assets'] = pd.to_numeric(test_df['Total Assets'])
-test_df['Liabilities'] = pd.to_numeric(test_df['Liabilities'])
-
-# Feature Engineering: Ratio of Liabilities to Assets for test data
-test_df['Feature_engineering_promt'] = np.log((test_df['Liabilities'] +1)/ (test_df['Total Assets'] + 1)) 
-
-
-# Define features and target variable
-features = ['Party', 'Criminal Case', 'state', 'Feature_engineering_promt']
-X = train_df[features]
-y = train_df['Education']
+"""KNN model predicting candidate education level from the election dataset.
 
-# Scale features
-scaler = MinMaxScaler()
-x_parameters = scaler.fit_transform(X)
+The encoders, feature engineering, MinMax scaler and KNN classifier form a
+single scikit-learn ``Pipeline``. ``train`` fits it once and saves it with
+versioned metadata; ``predict`` only loads it and streams a candidates file
+through it chunk by chunk, appending predictions to the output CSV so memory
+stays bounded regardless of the input size.
 
-#Grid_Search for best params
-KNN = KNeighborsClassifier()
-parameters = {'n_neighbors': (1,31), 'weights': ['uniform'], 'metric': ['euclidean']}
-trained_data = GridSearchCV(KNN, parameters, cv=5)
+Usage::
 
-# Fit the model
-trained_data.fit(x_parameters, y)
+    python cs253.py train --train train.csv --model models/cs253_knn.joblib
+    python cs253.py predict --input test.csv --output submission.csv --chunksize 100000
+    python cs253.py predict ... --resume   # continue an interrupted scoring run
+"""
 
+import argparse
+import hashlib
+import time
+from datetime import datetime, timezone
+from pathlib import Path
 
+import joblib
+import pandas as pd
+import numpy as np
+import sklearn
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, MinMaxScaler, OrdinalEncoder
+from sklearn.neighbors import KNeighborsClassifier
 
+from election_data import EDUCATION_LEVELS, iter_candidates, liability_asset_features, load_candidates
+from knn_search import sweep_n_neighbors
 
-# Scale test features
-KNN.fit(x_parameters, y)
-
-# Scaled and made predictions
-X_test_scaled = scaler.transform(test_df[features])
-predictions = KNN.predict(X_test_scaled)
-
-education_remapping = {v: k for k, v in education_mapping.items()}
-predicted_df = pd.DataFrame({'ID': test_df['ID'], 'Education': [education_remapping[int(prediction)] for prediction in predictions]})
+TRAIN_PATH = '/kaggle/input/shivam/train.csv'
+TEST_PATH = '/kaggle/input/shivam/test.csv'
+SUBMISSION_PATH = 'submission.csv'
+N_NEIGHBORS_RANGE = range(1, 32)
+MODEL_PATH = Path('models/cs253_knn.joblib')
+MODEL_FORMAT_VERSION = 2
 
-# Store predictions to CSV
-predicted_df.to_csv('submission.csv', index=False)
+# Define features and target variable
+features = ['Party', 'Criminal Case', 'state', 'Feature_engineering_promt']
+education_mapping = EDUCATION_LEVELS
+
+# Lookup array so predicted levels decode to labels with one vectorised take
+education_labels = np.empty(max(education_mapping.values()) + 1, dtype=object)
+for name, level in education_mapping.items():
+    education_labels[level] = name
+
+
+def build_pipeline():
+    # One encoder per categorical column, plus the Liabilities/Assets log-ratio feature.
+    # Parties or states unseen in training encode as -1, which the MinMax scaler maps
+    # just below the known codes' [0, 1] range instead of aborting a scoring run.
+    columns = ColumnTransformer(
+        transformers=[
+            ('party', OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1), ['Party']),
+            ('criminal_case', 'passthrough', ['Criminal Case']),
+            ('state', OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1), ['state']),
+            ('liability_ratio', FunctionTransformer(liability_asset_features), ['Total Assets', 'Liabilities']),
+        ]
+    )
+    knn = KNeighborsClassifier(weights='uniform', metric='euclidean', algorithm='kd_tree')
+    return Pipeline(steps=[('features', columns), ('scaler', MinMaxScaler()), ('knn', knn)])
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def train(train_path=TRAIN_PATH, model_path=MODEL_PATH, n_jobs=-1):
+    """Fit the pipeline on ``train_path`` and save it with its metadata."""
+
+    # Read the training data (money columns are parsed to rupees by the loader)
+    train_df = load_candidates(train_path)
+    y = train_df['Education'].map(education_mapping).astype('int64')
+
+    pipeline = build_pipeline()
+
+    # Search n_neighbors over 1..31: one KD-tree query per CV fold scores every k, folds run in parallel
+    search = sweep_n_neighbors(pipeline, train_df, y, N_NEIGHBORS_RANGE, cv=5, n_jobs=n_jobs)
+
+    # Fit the tuned model that is actually used for prediction
+    pipeline.set_params(knn__n_neighbors=search.best_k)
+    pipeline.fit(train_df, y)
+
+    metadata = {
+        'format_version': MODEL_FORMAT_VERSION,
+        'trained_at': datetime.now(timezone.utc).isoformat(),
+        'sklearn_version': sklearn.__version__,
+        'features': features,
+        'n_neighbors': search.best_k,
+        'cv_accuracy': search.best_score,
+        'train_rows': len(train_df),
+        'train_sha256': file_digest(train_path),
+    }
+    model_path = Path(model_path)
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump({'pipeline': pipeline, 'metadata': metadata}, model_path)
+    return pipeline, metadata
+
+
+def load_model(model_path=MODEL_PATH):
+    artifact = joblib.load(model_path)
+    metadata = artifact['metadata']
+    if metadata.get('format_version') != MODEL_FORMAT_VERSION:
+        raise ValueError(f"{model_path} has format version {metadata.get('format_version')}, expected {MODEL_FORMAT_VERSION}")
+    return artifact['pipeline'], metadata
+
+
+def count_scored_rows(output_path):
+    """Count complete prediction rows in ``output_path``, dropping any partial last line.
+
+    An interrupted write can leave an unterminated line behind; the file is
+    truncated back to its last newline so resumed output appends cleanly.
+    """
+
+    path = Path(output_path)
+    if not path.exists():
+        return 0
+    lines = complete_bytes = offset = 0
+    with open(path, 'r+b') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            newlines = block.count(b'\n')
+            if newlines:
+                lines += newlines
+                complete_bytes = offset + block.rindex(b'\n') + 1
+            offset += len(block)
+        if complete_bytes != offset:
+            handle.truncate(complete_bytes)
+    return max(lines - 1, 0)
+
+
+def score_file(pipeline, input_path=TEST_PATH, output_path=SUBMISSION_PATH, chunksize=100_000, resume=False):
+    """Stream ``input_path`` through the fitted pipeline, appending to ``output_path``."""
+
+    done = count_scored_rows(output_path) if resume else 0
+    rows = 0
+    start = time.perf_counter()
+    for chunk in iter_candidates(input_path, chunksize, skip_rows=done):
+        predictions = pipeline.predict(chunk)
+        predicted_df = pd.DataFrame({'ID': chunk['ID'], 'Education': education_labels[predictions.astype(np.int64)]})
+        # Store predictions to CSV, writing the header only for a fresh file
+        first_write = rows == 0 and done == 0
+        predicted_df.to_csv(output_path, mode='w' if first_write else 'a', header=first_write, index=False)
+        rows += len(chunk)
+    seconds = time.perf_counter() - start
+    return {'rows': rows, 'skipped': done, 'seconds': seconds, 'rows_per_second': rows / seconds if seconds else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Train the KNN pipeline or stream predictions for a candidates file.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = commands.add_parser('train', help='fit the pipeline and save it')
+    train_parser.add_argument('--train', default=TRAIN_PATH)
+    train_parser.add_argument('--model', default=MODEL_PATH, type=Path)
+    train_parser.add_argument('--n-jobs', type=int, default=-1, help='processes used for the CV folds')
+
+    predict_parser = commands.add_parser('predict', help='load a saved pipeline and score a file')
+    predict_parser.add_argument('--input', default=TEST_PATH)
+    predict_parser.add_argument('--output', default=SUBMISSION_PATH)
+    predict_parser.add_argument('--model', default=MODEL_PATH, type=Path)
+    predict_parser.add_argument('--chunksize', type=int, default=100_000)
+    predict_parser.add_argument('--resume', action='store_true', help='skip rows already present in --output')
+    args = parser.parse_args(argv)
+
+    if args.command == 'train':
+        start = time.perf_counter()
+        _, metadata = train(args.train, args.model, args.n_jobs)
+        print(f"Best n_neighbors={metadata['n_neighbors']} (CV accuracy {metadata['cv_accuracy']:.3f})")
+        print(f'Saved pipeline to {args.model} in {time.perf_counter() - start:.2f}s')
+        return
+
+    start = time.perf_counter()
+    pipeline, metadata = load_model(args.model)
+    print(f"Loaded pipeline trained at {metadata['trained_at']} in {time.perf_counter() - start:.3f}s")
+    stats = score_file(pipeline, args.input, args.output, args.chunksize, args.resume)
+    print(f"Scored {stats['rows']:,} rows in {stats['seconds']:.2f}s ({stats['rows_per_second']:,.0f} rows/sec)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Fast loader for the election candidates dataset used by ``cs253.py``.
+
+The raw CSVs store money amounts as Indian-unit strings such as
+``"211 Crore+"``, ``"13 Lac+"``, ``"4 Thou+"`` or a bare ``"0"``. Because the
+same few hundred strings repeat across thousands of candidates, the money
+columns are read as categoricals and only the distinct categories are
+parsed; the per-row values are then a single ``take`` over the category codes.
+Only the columns the model needs are read, with explicit dtypes, and
+``Party``/``state`` come back as compact categoricals.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+MONEY_UNITS = {"Crore+": 1e7, "Lac+": 1e5, "Thou+": 1e3, "Hund+": 1e2, "": 1.0}
+MONEY_COLUMNS = ["Total Assets", "Liabilities"]
+CATEGORICAL_COLUMNS = ["Party", "state"]
+EDUCATION_LEVELS = {
+    "Doctorate": 10,
+    "Post Graduate": 9,
+    "Graduate Professional": 8,
+    "Graduate": 7,
+    "12th Pass": 6,
+    "10th Pass": 5,
+    "8th Pass": 4,
+    "5th Pass": 3,
+    "Literate": 2,
+    "Others": 1,
+}
+COLUMN_DTYPES = {
+    "ID": "int64",
+    "Party": "category",
+    "Criminal Case": "int32",
+    "Total Assets": "category",
+    "Liabilities": "category",
+    "state": "category",
+    "Education": "category",
+}
+
+
+def parse_money_strings(values: Iterable[str]) -> np.ndarray:
+    """Convert strings such as ``"211 Crore+"`` into rupee amounts.
+
+    Raises
+    ------
+    ValueError
+        If a value carries a unit outside ``MONEY_UNITS``.
+    """
+
+    values = list(values)
+    if not values:
+        return np.empty(0, dtype=np.float64)
+    parts = pd.Series(values, dtype="object").str.partition(" ")
+    amounts = pd.to_numeric(parts[0]).to_numpy(dtype=np.float64)
+    multipliers = parts[2].map(MONEY_UNITS)
+    unknown = multipliers.isna()
+    if unknown.any():
+        raise ValueError(f"Unrecognised money units: {sorted(set(parts[2][unknown]))}")
+    return amounts * multipliers.to_numpy(dtype=np.float64)
+
+
+def parse_money(column: pd.Series) -> pd.Series:
+    """Parse a money column, touching each distinct string only once."""
+
+    categorical = column if isinstance(column.dtype, pd.CategoricalDtype) else column.astype("category")
+    parsed_categories = parse_money_strings(categorical.cat.categories.astype(str))
+    codes = categorical.cat.codes.to_numpy()
+    if (codes < 0).any():
+        raise ValueError(f"Column {column.name!r} contains missing values")
+    return pd.Series(parsed_categories[codes], index=column.index, name=column.name)
+
+
+def liability_asset_log_ratio(frame: pd.DataFrame) -> pd.Series:
+    """Return ``log((Liabilities + 1) / (Total Assets + 1))``."""
+
+    return np.log((frame["Liabilities"] + 1) / (frame["Total Assets"] + 1))
+
+
+def liability_asset_features(frame: pd.DataFrame) -> np.ndarray:
+    """Column-vector form of ``liability_asset_log_ratio`` for use in pipelines."""
+
+    return liability_asset_log_ratio(frame).to_numpy().reshape(-1, 1)
+
+
+def prepare_candidates(frame: pd.DataFrame) -> pd.DataFrame:
+    """Parse the money columns of a frame read with ``COLUMN_DTYPES``."""
+
+    for column in MONEY_COLUMNS:
+        frame[column] = parse_money(frame[column])
+    return frame
+
+
+def _read_options(columns: Iterable[str] | None) -> dict:
+    wanted = set(COLUMN_DTYPES) if columns is None else set(columns)
+    return {"usecols": lambda name: name in wanted, "dtype": COLUMN_DTYPES}
+
+
+def load_candidates(path: str | Path, columns: Iterable[str] | None = None) -> pd.DataFrame:
+    """Read a candidates CSV with parsed money columns and categorical labels.
+
+    Parameters
+    ----------
+    path:
+        Location of ``train.csv`` or ``test.csv``.
+    columns:
+        Columns to keep; defaults to every column in ``COLUMN_DTYPES`` that is
+        present in the file (``Education`` is absent from the test split).
+    """
+
+    return prepare_candidates(pd.read_csv(path, **_read_options(columns)))
+
+
+def iter_candidates(
+    path: str | Path,
+    chunksize: int,
+    columns: Iterable[str] | None = None,
+    skip_rows: int = 0,
+) -> Iterator[pd.DataFrame]:
+    """Stream a candidates CSV as prepared chunks of at most ``chunksize`` rows.
+
+    ``skip_rows`` data rows (after the header) are skipped, which lets an
+    interrupted scoring run resume where it stopped.
+    """
+
+    options = _read_options(columns)
+    skip = range(1, skip_rows + 1) if skip_rows else None
+    with pd.read_csv(path, chunksize=chunksize, skiprows=skip, **options) as reader:
+        for chunk in reader:
+            # A file with no rows left (e.g. resuming a finished run) yields one empty chunk.
+            if len(chunk):
+                yield prepare_candidates(chunk)
@@ -1,4 +1,10 @@
-"""Sequential machine learning curriculum package."""
+"""Sequential machine learning curriculum package.
+
+Submodules are imported on first attribute access (``lessons.lesson05_model_evaluation``),
+so ``import lessons`` stays cheap.
+"""
+
+import importlib
 
 __all__ = [
     "lesson01_python_foundations",
@@ -10,4 +16,18 @@ __all__ = [
     "lesson07_unsupervised_learning",
     "lesson08_deep_learning",
     "lesson09_model_deployment",
+    "artifacts",
+    "transform_cache",
+    "preprocessing_output",
+    "dataset_registry",
 ]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,50 @@
+"""Deferred imports for the heavy dependencies of the lesson modules.
+
+``lazy_import("sklearn.linear_model")`` returns a stand-in module object that
+performs the real import the first time one of its attributes is read, so
+``import lessons.lessonXX`` only pays for pandas, scikit-learn or joblib once
+a function that needs them actually runs. Modules that are already imported
+are returned as-is.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import threading
+import types
+from typing import Any
+
+_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports ``name`` on first attribute access."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            with _lock:
+                module = self.__dict__["_module"] or importlib.import_module(self.__name__)
+                self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._load(), attribute)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Return module ``name``, deferring the import until it is first used."""
+
+    return sys.modules.get(name) or LazyModule(name)
@@ -0,0 +1,137 @@
+"""Memory-mappable model artifacts shared by the deep learning and deployment lessons.
+
+Pickled artifacts (``joblib.dump``) have to be fully deserialised by every
+process that loads them. For models that are essentially a handful of weight
+arrays it is cheaper to store the raw buffers and ``np.memmap`` them: every
+worker process then shares the same physical pages through the OS page cache
+and loading costs little more than reading a small header.
+
+File layout
+-----------
+``MAGIC`` (8 bytes) | header length (little-endian uint64) | JSON header |
+padding | array buffers, each starting on an ``ALIGNMENT``-byte boundary.
+
+The JSON header records the format version, free-form metadata (feature
+names, hyper-parameters, ...) and the dtype, shape and byte offset of every
+array.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Mapping
+
+import numpy as np
+
+MAGIC = b"LSNART\x00\x01"
+ARTIFACT_FORMAT_VERSION = 1
+ALIGNMENT = 64
+MAPPED_ARTIFACT_SUFFIX = ".mmap"
+
+_LENGTH = struct.Struct("<Q")
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+@dataclass(frozen=True)
+class MappedArtifact:
+    """Arrays and metadata read from a memory-mapped artifact."""
+
+    arrays: dict[str, np.ndarray]
+    metadata: dict[str, Any] = field(default_factory=dict)
+    version: int = ARTIFACT_FORMAT_VERSION
+
+
+def is_mapped_artifact(path: Path) -> bool:
+    """Return ``True`` if ``path`` starts with the mapped-artifact magic bytes."""
+
+    try:
+        with open(path, "rb") as handle:
+            return handle.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def save_arrays(path: Path, arrays: Mapping[str, np.ndarray], metadata: Mapping[str, Any] | None = None) -> None:
+    """Write ``arrays`` as aligned raw buffers behind a JSON header.
+
+    The file is written to a uniquely named temporary sibling and moved into
+    place with ``os.replace``, so readers never observe a partially written
+    artifact and concurrent writers never truncate each other's file.
+    """
+
+    path = Path(path)
+    contiguous = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+
+    # The header size depends on the offsets, which depend on the header size;
+    # pad the length field generously so a single pass is enough.
+    specs: dict[str, dict[str, Any]] = {
+        name: {"dtype": array.dtype.str, "shape": list(array.shape), "offset": 0} for name, array in contiguous.items()
+    }
+    header = {"version": ARTIFACT_FORMAT_VERSION, "metadata": dict(metadata or {}), "arrays": specs}
+    draft = json.dumps(header).encode()
+    data_start = _align(len(MAGIC) + _LENGTH.size + len(draft) + 32 * len(specs))
+
+    offset = data_start
+    for name, array in contiguous.items():
+        specs[name]["offset"] = offset
+        offset = _align(offset + array.nbytes)
+    encoded = json.dumps(header).encode()
+    if len(MAGIC) + _LENGTH.size + len(encoded) > data_start:
+        raise ValueError("Artifact header does not fit in the reserved space")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name, suffix=".tmp", delete=False) as handle:
+        try:
+            handle.write(MAGIC)
+            handle.write(_LENGTH.pack(len(encoded)))
+            handle.write(encoded)
+            for name, array in contiguous.items():
+                handle.seek(specs[name]["offset"])
+                handle.write(array.tobytes())
+            handle.truncate(max(offset, data_start))
+        except BaseException:
+            os.unlink(handle.name)
+            raise
+    os.replace(handle.name, path)
+
+
+def load_arrays(path: Path, mmap: bool = True) -> MappedArtifact:
+    """Load an artifact written by ``save_arrays``.
+
+    Parameters
+    ----------
+    path:
+        Location of the artifact.
+    mmap:
+        When ``True`` (the default) arrays are read-only views onto a shared
+        memory map of the file. When ``False`` they are private, writable
+        copies, which is what training code needs.
+    """
+
+    path = Path(path)
+    with open(path, "rb") as handle:
+        if handle.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a memory-mapped model artifact")
+        (header_length,) = _LENGTH.unpack(handle.read(_LENGTH.size))
+        header = json.loads(handle.read(header_length))
+
+    if header["version"] > ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact version {header['version']}")
+
+    buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays: dict[str, np.ndarray] = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        count = int(np.prod(shape, dtype=np.int64))
+        view = np.frombuffer(buffer, dtype=dtype, count=count, offset=spec["offset"]).reshape(shape)
+        arrays[name] = view if mmap else view.copy()
+    return MappedArtifact(arrays=arrays, metadata=header["metadata"], version=header["version"])
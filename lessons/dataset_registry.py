@@ -0,0 +1,128 @@
+"""Process-wide registry of the bundled scikit-learn datasets used by the lessons.
+
+Every ``load_diabetes()``/``load_iris()`` call re-parses the CSV files that
+ship with scikit-learn and builds fresh arrays. ``get_dataset`` does that once
+per process and hands out the same read-only, C-contiguous arrays to every
+caller, so a batch run of the lessons parses each dataset exactly once and no
+lesson can accidentally modify another's data.
+
+With a cache directory (``cache_dir=`` or the ``ML_LESSON_DATASET_CACHE``
+environment variable) the arrays are also written as ``.npy`` files on first
+use; later processes memory-map them instead of parsing anything.
+``sklearn.datasets`` itself is only imported when a dataset is first parsed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Callable
+
+import numpy as np
+
+try:
+    from lessons._lazy import lazy_import
+except ModuleNotFoundError:  # executed from inside ``lessons/``
+    from _lazy import lazy_import
+
+sklearn_datasets = lazy_import("sklearn.datasets")
+
+DATASET_CACHE_DIR = Path(os.environ["ML_LESSON_DATASET_CACHE"]) if os.getenv("ML_LESSON_DATASET_CACHE") else None
+
+# Dataset name -> loader function in ``sklearn.datasets``.
+LOADERS: dict[str, str] = {
+    "diabetes": "load_diabetes",
+    "iris": "load_iris",
+    "wine": "load_wine",
+    "california_housing": "fetch_california_housing",
+}
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Read-only features, target and feature names of one dataset."""
+
+    data: np.ndarray
+    target: np.ndarray
+    feature_names: tuple[str, ...]
+
+
+_registry: dict[str, Dataset] = {}
+_lock = threading.Lock()
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array = np.ascontiguousarray(array)
+    array.flags.writeable = False
+    return array
+
+
+def _cache_paths(cache_dir: Path, name: str) -> tuple[Path, Path, Path]:
+    return cache_dir / f"{name}.data.npy", cache_dir / f"{name}.target.npy", cache_dir / f"{name}.json"
+
+
+def _atomic_write(path: Path, write: Callable[[IO[bytes]], None]) -> None:
+    # A uniquely named sibling plus ``os.replace``: concurrent writers never share a
+    # temporary file and readers never see a partial one.
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name, suffix=".tmp", delete=False) as handle:
+        try:
+            write(handle)
+        except BaseException:
+            os.unlink(handle.name)
+            raise
+    os.replace(handle.name, path)
+
+
+def _load(name: str, cache_dir: Path | None) -> Dataset:
+    if cache_dir is not None:
+        data_path, target_path, names_path = _cache_paths(cache_dir, name)
+        if data_path.exists() and target_path.exists() and names_path.exists():
+            return Dataset(
+                data=np.load(data_path, mmap_mode="r"),
+                target=np.load(target_path, mmap_mode="r"),
+                feature_names=tuple(json.loads(names_path.read_text())),
+            )
+
+    bunch = getattr(sklearn_datasets, LOADERS[name])()
+    dataset = Dataset(
+        data=_read_only(bunch.data), target=_read_only(bunch.target), feature_names=tuple(bunch.feature_names)
+    )
+    if cache_dir is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Readers need all three files, so the names go first and the target array,
+        # published last, marks the entry complete.
+        _atomic_write(names_path, lambda handle: handle.write(json.dumps(list(dataset.feature_names)).encode()))
+        for path, array in ((data_path, dataset.data), (target_path, dataset.target)):
+            _atomic_write(path, lambda handle, array=array: np.save(handle, array))
+    return dataset
+
+
+def get_dataset(name: str, cache_dir: Path | None = None) -> Dataset:
+    """Return the process-wide copy of dataset ``name``, loading it on first use.
+
+    Parameters
+    ----------
+    name:
+        One of ``LOADERS``.
+    cache_dir:
+        Directory for the ``.npy`` mmap cache; defaults to
+        ``DATASET_CACHE_DIR``. Only consulted on the first load.
+    """
+
+    if name not in LOADERS:
+        raise KeyError(f"Unknown dataset {name!r}; expected one of {sorted(LOADERS)}")
+    with _lock:
+        if name not in _registry:
+            _registry[name] = _load(name, Path(cache_dir) if cache_dir is not None else DATASET_CACHE_DIR)
+        return _registry[name]
+
+
+def clear_datasets() -> None:
+    """Forget every loaded dataset (the on-disk cache is left alone)."""
+
+    with _lock:
+        _registry.clear()
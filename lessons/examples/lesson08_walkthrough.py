@@ -12,3 +12,6 @@ for epoch in range(200):
     loss = model.train_step(X, y)
     if epoch % 50 == 0:
         print(f"Epoch {epoch:03d} – Loss: {loss:.4f}")
+
+history = model.fit(X, y, batch_size=32, epochs=20)
+print(f"Mini-batch loss: {history.losses[-1]:.4f} ({history.samples_per_second:,.0f} samples/sec)")
@@ -9,3 +9,4 @@ if not MODEL_PATH.exists():
 service = ModelService()
 sample = [0.03807591, 0.05068012, 0.06169621, 0.02187235, -0.0442235, -0.03482076, -0.04340085, -0.00259226, 0.01990842, -0.01764613]
 print("Sample prediction:", service.predict(sample))
+print("Batch predictions:", service.predict_batch([sample, sample]))
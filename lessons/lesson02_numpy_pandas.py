@@ -12,7 +12,14 @@ Running the module executes short demonstrations that showcase the material.
 from __future__ import annotations
 
 import numpy as np
-import pandas as pd
+
+try:
+    from lessons._lazy import lazy_import
+except ModuleNotFoundError:  # executed as ``python lessons/lesson02_numpy_pandas.py``
+    from _lazy import lazy_import
+
+# Only engineer_features and the demo need pandas; importing it is deferred until then.
+pd = lazy_import("pandas")
 
 
 def basic_statistics(array: np.ndarray) -> dict[str, float]:
@@ -36,14 +43,25 @@ def normalise(array: np.ndarray) -> np.ndarray:
     return (array - mean) / std
 
 
-def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Create additional columns using vectorised Pandas operations."""
+def engineer_features(df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+    """Create additional columns using vectorised Pandas operations.
 
-    engineered = df.copy()
-    engineered["price_per_room"] = engineered["price"] / engineered["rooms"]
-    engineered["is_expensive"] = engineered["price"] > engineered["price"].median()
-    engineered["log_price"] = np.log1p(engineered["price"])
-    return engineered
+    The input columns are not copied: the result shares them with ``df``
+    (copy-on-write protects ``df`` from later edits), or the new columns are
+    added to ``df`` itself when ``inplace`` is true.
+    """
+
+    price = df["price"].to_numpy(dtype=np.float64)
+    features = {
+        "price_per_room": price / df["rooms"].to_numpy(dtype=np.float64),
+        "is_expensive": price > np.nanmedian(price),
+        "log_price": np.log1p(price),
+    }
+    if not inplace:
+        return df.assign(**features)
+    for name, values in features.items():
+        df[name] = values
+    return df
 
 
 if __name__ == "__main__":
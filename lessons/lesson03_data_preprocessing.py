@@ -7,17 +7,32 @@ Concepts covered
 - Exploratory plots and summary statistics.
 - Train/validation/test splits.
 
-The code below uses synthetic data to demonstrate each step.
+The code below uses synthetic data to demonstrate each step. Passing a
+``TransformCache`` to ``build_preprocessing_pipeline`` memoises each branch,
+so cross-validating several downstream models reuses the preprocessing.
+``output="sparse"`` keeps the one-hot block sparse end to end, and
+``transform_into`` fills a preallocated float32 matrix without intermediate
+copies (see ``lessons.preprocessing_output``).
 """
 
 from __future__ import annotations
 
-import pandas as pd
-from sklearn.compose import ColumnTransformer
-from sklearn.impute import SimpleImputer
-from sklearn.model_selection import train_test_split
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+try:
+    from lessons._lazy import lazy_import
+    from lessons.preprocessing_output import sparse_threshold_for, transform_into
+except ModuleNotFoundError:  # executed as ``python lessons/lesson03_data_preprocessing.py``
+    from _lazy import lazy_import
+    from preprocessing_output import sparse_threshold_for, transform_into
+
+pd = lazy_import("pandas")
+compose = lazy_import("sklearn.compose")
+impute = lazy_import("sklearn.impute")
+model_selection = lazy_import("sklearn.model_selection")
+pipeline = lazy_import("sklearn.pipeline")
+preprocessing = lazy_import("sklearn.preprocessing")
+# CachedTransformer subclasses scikit-learn's BaseEstimator, so only load it when a cache is used.
+transform_cache = lazy_import(f"{__package__}.transform_cache" if __package__ else "transform_cache")
 
 
 def load_raw_housing_data() -> pd.DataFrame:
@@ -34,22 +49,38 @@ def load_raw_housing_data() -> pd.DataFrame:
     )
 
 
-def build_preprocessing_pipeline(df: pd.DataFrame) -> Pipeline:
-    """Construct a preprocessing pipeline to clean the dataset."""
+def build_preprocessing_pipeline(
+    df: pd.DataFrame, cache: transform_cache.TransformCache | None = None, output: str = "default"
+) -> pipeline.Pipeline:
+    """Construct a preprocessing pipeline to clean the dataset.
+
+    With ``cache`` each branch is wrapped in ``CachedTransformer``;
+    ``output="sparse"`` always returns a CSR matrix.
+    """
 
     numeric_features = ["rooms", "age_years"]
     categorical_features = ["location", "style"]
 
-    numeric_transformer = Pipeline(steps=[("imputer", SimpleImputer(strategy="median")), ("scaler", StandardScaler())])
-    categorical_transformer = Pipeline(
-        steps=[("imputer", SimpleImputer(strategy="most_frequent")), ("encoder", OneHotEncoder(handle_unknown="ignore"))]
+    numeric_transformer = pipeline.Pipeline(
+        steps=[("imputer", impute.SimpleImputer(strategy="median")), ("scaler", preprocessing.StandardScaler())]
+    )
+    categorical_transformer = pipeline.Pipeline(
+        steps=[
+            ("imputer", impute.SimpleImputer(strategy="most_frequent")),
+            ("encoder", preprocessing.OneHotEncoder(handle_unknown="ignore")),
+        ]
     )
 
-    preprocessor = ColumnTransformer(
+    if cache is not None:
+        numeric_transformer = transform_cache.CachedTransformer(numeric_transformer, cache)
+        categorical_transformer = transform_cache.CachedTransformer(categorical_transformer, cache)
+
+    preprocessor = compose.ColumnTransformer(
         transformers=[
             ("num", numeric_transformer, numeric_features),
             ("cat", categorical_transformer, categorical_features),
-        ]
+        ],
+        sparse_threshold=sparse_threshold_for(output),
     )
 
     return preprocessor
@@ -61,7 +92,7 @@ if __name__ == "__main__":
     raw = load_raw_housing_data()
     print("Raw data:\n", raw)
 
-    train, test = train_test_split(raw, test_size=0.2, random_state=42)
+    train, test = model_selection.train_test_split(raw, test_size=0.2, random_state=42)
     print("Train set size:", len(train), "Test set size:", len(test))
 
     preprocessor = build_preprocessing_pipeline(raw)
@@ -70,3 +101,12 @@ if __name__ == "__main__":
 
     encoded_feature_names = list(preprocessor.named_transformers_["cat"].named_steps["encoder"].get_feature_names_out())
     print("Encoded categorical features:", encoded_feature_names)
+
+    cache = transform_cache.TransformCache()
+    for _ in range(3):
+        build_preprocessing_pipeline(raw, cache=cache).fit(train).transform(test)
+    print(f"Transform cache: {cache.hits} hits, {cache.misses} misses, {cache.nbytes} bytes")
+
+    sparse_preprocessor = build_preprocessing_pipeline(raw, output="sparse").fit(train)
+    print("Sparse output:", type(sparse_preprocessor.transform(test)).__name__)
+    print("float32 output:", transform_into(sparse_preprocessor, test).dtype)
@@ -3,46 +3,301 @@
 This module demonstrates a complete supervised learning pipeline using
 scikit-learn. It covers regression and classification examples, emphasising
 model training, hyper-parameter tuning, and evaluation.
+
+Efficient hyper-parameter search
+--------------------------------
+``CachedGridSearch`` is a drop-in for ``GridSearchCV`` that plans every
+(parameters × fold) cell up front, runs them on a process pool sized so that
+pool workers times forest threads never exceeds the core count, and memoises
+each cell's score on disk keyed by a hash of the data and the parameters. A
+rerun with one extra grid value therefore only computes the new cells. Cells
+that differ only in ``n_estimators`` share one warm-started forest, so the
+100-tree model is grown from the 50-tree one instead of from scratch.
+
+Both trainers also accept ``search_mode="halving"``, which swaps exhaustive
+search for successive halving: every candidate starts on a small budget and
+only the best third is promoted to the next, three times larger, one. For
+forests the budget is the number of trees (``n_estimators`` turns from a grid
+axis into the budget, capped at the grid's largest value), because on small
+tabular datasets the per-tree cost, not the sample count, dominates fit time.
+The halving rounds only rank candidates; since ``min_resources * 3**i``
+rarely lands on the cap exactly, the winner is refitted with the grid's
+largest ``n_estimators``.
+Pass ``halving_resource="n_samples"`` to budget training rows instead.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from itertools import product
+from pathlib import Path
+from typing import Any
+
 import numpy as np
-from sklearn.datasets import fetch_california_housing, load_wine
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-from sklearn.metrics import accuracy_score, mean_squared_error
-from sklearn.model_selection import GridSearchCV, train_test_split
 
+try:
+    from lessons._lazy import lazy_import
+    from lessons.dataset_registry import get_dataset
+except ModuleNotFoundError:  # executed as ``python lessons/lesson04_supervised_learning.py``
+    from _lazy import lazy_import
+    from dataset_registry import get_dataset
+
+pd = lazy_import("pandas")
+joblib = lazy_import("joblib")
+sklearn_base = lazy_import("sklearn.base")
+ensemble = lazy_import("sklearn.ensemble")
+metrics = lazy_import("sklearn.metrics")
+model_selection = lazy_import("sklearn.model_selection")
+
+GRID_CACHE_DIR = Path(".grid_cache")
+SEARCH_MODES = ("grid", "halving")
+
+
+def _data_fingerprint(X: np.ndarray, y: np.ndarray) -> str:
+    digest = hashlib.sha256()
+    for array in (np.ascontiguousarray(X), np.ascontiguousarray(y)):
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def _fit_warm_start_chain(
+    estimator: sklearn_base.BaseEstimator,
+    params: dict[str, Any],
+    n_estimators: list[int],
+    X: np.ndarray,
+    y: np.ndarray,
+    train_index: np.ndarray,
+    test_index: np.ndarray,
+    n_threads: int,
+) -> list[float]:
+    """Grow one forest through ascending ``n_estimators`` values, scoring each size."""
+
+    model = sklearn_base.clone(estimator).set_params(**params, warm_start=True, n_jobs=n_threads)
+    scores = []
+    for n_trees in n_estimators:
+        model.set_params(n_estimators=n_trees)
+        model.fit(X[train_index], y[train_index])
+        scores.append(float(model.score(X[test_index], y[test_index])))
+    return scores
+
+
+@dataclass
+class CachedGridSearch:
+    """Parallel, disk-memoised grid search for random forests.
+
+    Exposes the parts of the ``GridSearchCV`` interface the lessons use:
+    ``fit``, ``predict``, ``best_params_``, ``best_score_``,
+    ``best_estimator_`` and ``cv_results_``. Scores use ``estimator.score``
+    (R² for regressors, accuracy for classifiers), as ``GridSearchCV`` does
+    by default. Set ``cache_dir=None`` to disable memoisation.
+    """
+
+    estimator: sklearn_base.BaseEstimator
+    param_grid: dict[str, list]
+    cv: int = 5
+    n_jobs: int = -1
+    cache_dir: Path | None = GRID_CACHE_DIR
+    cache_hits_: int = field(default=0, init=False)
+    cache_misses_: int = field(default=0, init=False)
+
+    def _cell_key(self, fingerprint: str, params: dict[str, Any], fold: int) -> str:
+        payload = {
+            "data": fingerprint,
+            "estimator": type(self.estimator).__name__,
+            "base_params": {key: repr(value) for key, value in sorted(self.estimator.get_params().items())},
+            "params": {key: repr(value) for key, value in sorted(params.items())},
+            "cv": self.cv,
+            "fold": fold,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _read_cache(self, key: str) -> float | None:
+        if self.cache_dir is None:
+            return None
+        try:
+            return float(json.loads((Path(self.cache_dir) / f"{key}.json").read_text())["score"])
+        except (OSError, ValueError, KeyError, TypeError):  # missing or unreadable cells are recomputed
+            return None
+
+    def _write_cache(self, key: str, score: float) -> None:
+        if self.cache_dir is None:
+            return
+        cache_dir = Path(self.cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Publish with os.replace so concurrent or interrupted runs never leave a truncated cell.
+        with tempfile.NamedTemporaryFile("w", dir=cache_dir, suffix=".tmp", delete=False) as handle:
+            json.dump({"score": score}, handle)
+        os.replace(handle.name, cache_dir / f"{key}.json")
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> "CachedGridSearch":
+        X = np.asarray(X)
+        y = np.asarray(y)
+        fingerprint = _data_fingerprint(X, y)
+        classifier = sklearn_base.is_classifier(self.estimator)
+        folds = list(model_selection.check_cv(self.cv, y, classifier=classifier).split(X, y))
 
-def train_regression_model() -> dict[str, float]:
-    """Train a random forest regressor on the California housing dataset."""
+        # Cells that only differ in n_estimators form one warm-start chain.
+        tree_counts = sorted(self.param_grid.get("n_estimators", [self.estimator.get_params()["n_estimators"]]))
+        other_names = [name for name in self.param_grid if name != "n_estimators"]
+        other_settings = [dict(zip(other_names, values)) for values in product(*(self.param_grid[n] for n in other_names))]
 
-    data = fetch_california_housing()
-    X_train, X_test, y_train, y_test = train_test_split(data.data, data.target, test_size=0.2, random_state=42)
+        scores: dict[tuple[int, int, int], float] = {}
+        jobs = []
+        for setting_index, params in enumerate(other_settings):
+            for fold, (train_index, test_index) in enumerate(folds):
+                missing = []
+                for n_trees in tree_counts:
+                    cached = self._read_cache(self._cell_key(fingerprint, {**params, "n_estimators": n_trees}, fold))
+                    if cached is None:
+                        missing.append(n_trees)
+                    else:
+                        scores[setting_index, fold, n_trees] = cached
+                self.cache_hits_ += len(tree_counts) - len(missing)
+                self.cache_misses_ += len(missing)
+                if missing:
+                    # The forest has to be grown up to the largest missing size anyway.
+                    chain = [n for n in tree_counts if n <= max(missing)]
+                    jobs.append((setting_index, fold, params, chain, train_index, test_index))
 
-    model = RandomForestRegressor(random_state=42)
+        if jobs:
+            n_cpus = os.cpu_count() or 1
+            n_workers = min(len(jobs), n_cpus if self.n_jobs in (-1, None) else max(1, self.n_jobs))
+            n_threads = max(1, n_cpus // n_workers)
+            results = joblib.Parallel(n_jobs=n_workers)(
+                joblib.delayed(_fit_warm_start_chain)(
+                    self.estimator, params, chain, X, y, train_index, test_index, n_threads
+                )
+                for _, _, params, chain, train_index, test_index in jobs
+            )
+            for (setting_index, fold, params, chain, _, _), chain_scores in zip(jobs, results):
+                for n_trees, score in zip(chain, chain_scores):
+                    scores[setting_index, fold, n_trees] = score
+                    self._write_cache(self._cell_key(fingerprint, {**params, "n_estimators": n_trees}, fold), score)
+
+        rows = []
+        for (setting_index, params), n_trees in product(enumerate(other_settings), tree_counts):
+            fold_scores = [scores[setting_index, fold, n_trees] for fold in range(len(folds))]
+            rows.append(
+                {
+                    "params": {**params, "n_estimators": n_trees},
+                    "mean_test_score": float(np.mean(fold_scores)),
+                    "std_test_score": float(np.std(fold_scores)),
+                }
+            )
+        self.cv_results_ = pd.DataFrame(rows)
+        self.cv_results_["rank_test_score"] = self.cv_results_["mean_test_score"].rank(ascending=False, method="min").astype(int)
+
+        best = self.cv_results_.loc[self.cv_results_["mean_test_score"].idxmax()]
+        self.best_params_ = best["params"]
+        self.best_score_ = float(best["mean_test_score"])
+        self.best_estimator_ = sklearn_base.clone(self.estimator).set_params(**self.best_params_, n_jobs=-1).fit(X, y)
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.best_estimator_.predict(X)
+
+
+@dataclass
+class TreeBudgetHalvingSearch:
+    """Successive halving over the tree count that refits the winner with the full budget.
+
+    ``search`` is a ``HalvingGridSearchCV`` with ``resource="n_estimators"``
+    and ``refit=False``; its schedule (e.g. 66 then 198 trees for a cap of 200)
+    is used for ranking only, and ``best_estimator_`` is grown with
+    ``max_resources`` trees so ``best_params_`` always names a grid value.
+    """
+
+    search: Any
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> "TreeBudgetHalvingSearch":
+        self.search.fit(X, y)
+        self.best_params_ = {**self.search.best_params_, "n_estimators": self.search.max_resources}
+        self.best_score_ = self.search.best_score_
+        self.cv_results_ = self.search.cv_results_
+        self.best_estimator_ = sklearn_base.clone(self.search.estimator).set_params(**self.best_params_).fit(X, y)
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.best_estimator_.predict(X)
+
+
+def build_search(
+    estimator: sklearn_base.BaseEstimator,
+    param_grid: dict[str, list],
+    search_mode: str = "grid",
+    cache_dir: Path | None = GRID_CACHE_DIR,
+    halving_resource: str = "n_estimators",
+) -> CachedGridSearch | TreeBudgetHalvingSearch | model_selection.HalvingGridSearchCV:
+    """Return an exhaustive (cached) or successive-halving search over ``param_grid``."""
+
+    if search_mode == "grid":
+        return CachedGridSearch(estimator, param_grid, cv=5, n_jobs=-1, cache_dir=cache_dir)
+    if search_mode == "halving":
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401  (enables HalvingGridSearchCV)
+
+        options: dict[str, Any] = {"resource": halving_resource}
+        if halving_resource == "n_estimators":
+            tree_counts = param_grid.get("n_estimators", [estimator.get_params()["n_estimators"]])
+            param_grid = {name: values for name, values in param_grid.items() if name != "n_estimators"}
+            options["max_resources"] = max(tree_counts)
+            options["refit"] = False
+        search = model_selection.HalvingGridSearchCV(
+            estimator, param_grid, cv=5, factor=3, min_resources="exhaust", n_jobs=-1, random_state=42, **options
+        )
+        return TreeBudgetHalvingSearch(search) if halving_resource == "n_estimators" else search
+    raise ValueError(f"search_mode must be one of {SEARCH_MODES}, got {search_mode!r}")
+
+
+def train_regression_model(
+    search_mode: str = "grid",
+    cache_dir: Path | None = GRID_CACHE_DIR,
+    X: np.ndarray | None = None,
+    y: np.ndarray | None = None,
+) -> dict[str, float]:
+    """Train a random forest regressor on the California housing dataset (or ``X``/``y``)."""
+
+    if X is None or y is None:
+        data = get_dataset("california_housing")
+        X, y = data.data, data.target
+    X_train, X_test, y_train, y_test = model_selection.train_test_split(X, y, test_size=0.2, random_state=42)
+
+    model = ensemble.RandomForestRegressor(random_state=42)
     param_grid = {"n_estimators": [50, 100], "max_depth": [None, 8, 16]}
-    search = GridSearchCV(model, param_grid, cv=5, n_jobs=-1)
+    search = build_search(model, param_grid, search_mode, cache_dir)
     search.fit(X_train, y_train)
 
     predictions = search.predict(X_test)
-    rmse = float(np.sqrt(mean_squared_error(y_test, predictions)))
+    rmse = float(np.sqrt(metrics.mean_squared_error(y_test, predictions)))
     return {"rmse": rmse, "best_params": search.best_params_}
 
 
-def train_classification_model() -> dict[str, float]:
-    """Train a random forest classifier on the wine dataset."""
+def train_classification_model(
+    search_mode: str = "grid",
+    cache_dir: Path | None = GRID_CACHE_DIR,
+    X: np.ndarray | None = None,
+    y: np.ndarray | None = None,
+) -> dict[str, float]:
+    """Train a random forest classifier on the wine dataset (or ``X``/``y``)."""
 
-    data = load_wine()
-    X_train, X_test, y_train, y_test = train_test_split(data.data, data.target, test_size=0.2, random_state=42, stratify=data.target)
+    if X is None or y is None:
+        data = get_dataset("wine")
+        X, y = data.data, data.target
+    X_train, X_test, y_train, y_test = model_selection.train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
 
-    model = RandomForestClassifier(random_state=42)
+    model = ensemble.RandomForestClassifier(random_state=42)
     param_grid = {"n_estimators": [100, 200], "max_depth": [None, 8, 16]}
-    search = GridSearchCV(model, param_grid, cv=5, n_jobs=-1)
+    search = build_search(model, param_grid, search_mode, cache_dir)
     search.fit(X_train, y_train)
 
     predictions = search.predict(X_test)
-    accuracy = float(accuracy_score(y_test, predictions))
+    accuracy = float(metrics.accuracy_score(y_test, predictions))
     return {"accuracy": accuracy, "best_params": search.best_params_}
 
 
@@ -52,3 +307,6 @@ if __name__ == "__main__":
 
     classification_results = train_classification_model()
     print("Classification results:", classification_results)
+
+    halving_results = train_classification_model(search_mode="halving")
+    print("Classification results (successive halving):", halving_results)
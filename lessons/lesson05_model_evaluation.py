@@ -6,24 +6,62 @@ Topics
 - Cross-validation techniques.
 - Regression and classification metrics.
 - Learning curves for diagnosing under/overfitting.
+
+Fast cross-validation for linear models
+---------------------------------------
+A ridge model only sees the data through the row count, the column and
+target means and the centred cross-products. ``RidgeStatistics`` holds those
+for a block of rows and can be merged and removed with Chan's pairwise
+update, so each CV fold is "all data minus the held-out block" and each
+learning-curve point is a running merge of chunks: every row is touched once.
+Centring each block keeps the numbers exact even when the targets carry a
+large offset, where raw sums such as ``yᵀy`` would cancel catastrophically.
+One eigendecomposition per fold then solves any number of ``alpha`` values
+at once. ``ridge_cross_validation`` and ``ridge_learning_curve`` reproduce
+the scikit-learn numbers this way.
+
+``stream_learning_curve`` is the incremental, generator form: each point
+extends the previous training prefix (through statistics for ``Ridge`` or
+``partial_fit`` for estimators such as ``SGDRegressor``) and is yielded as
+soon as it is ready.
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from typing import Iterable, Iterator, NamedTuple
+
 import numpy as np
-import pandas as pd
-from sklearn.datasets import load_diabetes
-from sklearn.linear_model import Ridge
-from sklearn.model_selection import KFold, cross_validate, learning_curve
+
+try:
+    from lessons._lazy import lazy_import
+    from lessons.dataset_registry import get_dataset
+except ModuleNotFoundError:  # executed as ``python lessons/lesson05_model_evaluation.py``
+    from _lazy import lazy_import
+    from dataset_registry import get_dataset
+
+pd = lazy_import("pandas")
+joblib = lazy_import("joblib")
+linear_model = lazy_import("sklearn.linear_model")
+model_selection = lazy_import("sklearn.model_selection")
+sklearn_base = lazy_import("sklearn.base")
+
+
+def _diabetes_arrays(X: np.ndarray | None, y: np.ndarray | None) -> tuple[np.ndarray, np.ndarray]:
+    if X is None or y is None:
+        data = get_dataset("diabetes")
+        return data.data, data.target
+    return X, y
 
 
-def evaluate_with_cross_validation() -> pd.DataFrame:
-    """Return cross-validation metrics for a Ridge regression model."""
+def evaluate_with_cross_validation(X: np.ndarray | None = None, y: np.ndarray | None = None) -> pd.DataFrame:
+    """Return cross-validation metrics for a Ridge regression model (diabetes data by default)."""
 
-    data = load_diabetes()
-    model = Ridge(alpha=1.0)
+    X, y = _diabetes_arrays(X, y)
+    model = linear_model.Ridge(alpha=1.0)
     scoring = {"rmse": "neg_root_mean_squared_error", "mae": "neg_mean_absolute_error"}
-    cv_results = cross_validate(model, data.data, data.target, cv=KFold(n_splits=5, shuffle=True, random_state=42), scoring=scoring)
+    cv = model_selection.KFold(n_splits=5, shuffle=True, random_state=42)
+    cv_results = model_selection.cross_validate(model, X, y, cv=cv, scoring=scoring)
 
     results = pd.DataFrame(cv_results)
     results["rmse"] = -results["test_rmse"]
@@ -31,14 +69,14 @@ def evaluate_with_cross_validation() -> pd.DataFrame:
     return results[["rmse", "mae", "fit_time", "score_time"]]
 
 
-def compute_learning_curve() -> pd.DataFrame:
-    """Compute a learning curve for the Ridge regression model."""
+def compute_learning_curve(X: np.ndarray | None = None, y: np.ndarray | None = None) -> pd.DataFrame:
+    """Compute a learning curve for the Ridge regression model (diabetes data by default)."""
 
-    data = load_diabetes()
-    train_sizes, train_scores, validation_scores = learning_curve(
-        Ridge(alpha=1.0),
-        data.data,
-        data.target,
+    X, y = _diabetes_arrays(X, y)
+    train_sizes, train_scores, validation_scores = model_selection.learning_curve(
+        linear_model.Ridge(alpha=1.0),
+        X,
+        y,
         cv=5,
         scoring="neg_root_mean_squared_error",
         train_sizes=np.linspace(0.1, 1.0, 5),
@@ -56,9 +94,243 @@ def compute_learning_curve() -> pd.DataFrame:
     return curve
 
 
+@dataclass
+class RidgeStatistics:
+    """Sufficient statistics of a block of rows for ridge regression with intercept.
+
+    ``x_mean`` and ``y_mean`` are the block means; ``xx``, ``xy`` and ``yy``
+    are the centred moments ``XcᵀXc``, ``Xcᵀyc`` and ``ycᵀyc`` with
+    ``Xc = X - x_mean`` and ``yc = y - y_mean``.
+    """
+
+    n_samples: int
+    x_mean: np.ndarray
+    y_mean: float
+    xx: np.ndarray
+    xy: np.ndarray
+    yy: float
+
+    @classmethod
+    def from_rows(cls, X: np.ndarray, y: np.ndarray) -> "RidgeStatistics":
+        x_mean = X.mean(axis=0)
+        y_mean = float(y.mean())
+        X_centred = X - x_mean
+        y_centred = y - y_mean
+        return cls(
+            len(X), x_mean, y_mean, X_centred.T @ X_centred, X_centred.T @ y_centred, float(y_centred @ y_centred)
+        )
+
+    def __add__(self, other: "RidgeStatistics") -> "RidgeStatistics":
+        # Chan et al.'s pairwise update: shift each block's moments to the merged mean.
+        n = self.n_samples + other.n_samples
+        weight = self.n_samples * other.n_samples / n
+        dx = other.x_mean - self.x_mean
+        dy = other.y_mean - self.y_mean
+        return RidgeStatistics(
+            n,
+            self.x_mean + dx * (other.n_samples / n),
+            self.y_mean + dy * (other.n_samples / n),
+            self.xx + other.xx + weight * np.outer(dx, dx),
+            self.xy + other.xy + weight * dx * dy,
+            self.yy + other.yy + weight * dy * dy,
+        )
+
+    def __sub__(self, other: "RidgeStatistics") -> "RidgeStatistics":
+        # Inverse of ``__add__``: recover the rest once ``other`` is taken out of ``self``.
+        n = self.n_samples - other.n_samples
+        x_mean = (self.n_samples * self.x_mean - other.n_samples * other.x_mean) / n
+        y_mean = (self.n_samples * self.y_mean - other.n_samples * other.y_mean) / n
+        weight = n * other.n_samples / self.n_samples
+        dx = other.x_mean - x_mean
+        dy = other.y_mean - y_mean
+        return RidgeStatistics(
+            n,
+            x_mean,
+            y_mean,
+            self.xx - other.xx - weight * np.outer(dx, dx),
+            self.xy - other.xy - weight * dx * dy,
+            self.yy - other.yy - weight * dy * dy,
+        )
+
+    def solve(self, alphas: np.ndarray) -> np.ndarray:
+        """Return augmented coefficients ``[w, intercept]`` with shape ``(len(alphas), n_features + 1)``.
+
+        Ridge does not penalise the intercept, so the problem is solved on the
+        centred moments from a single eigendecomposition shared by every
+        ``alpha``.
+        """
+
+        eigenvalues, eigenvectors = np.linalg.eigh(self.xx)
+        projected = eigenvectors.T @ self.xy
+        weights = (projected / (eigenvalues + np.asarray(alphas)[:, None])) @ eigenvectors.T
+        intercepts = self.y_mean - weights @ self.x_mean
+        return np.column_stack([weights, intercepts])
+
+    def sse(self, coefficients: np.ndarray) -> np.ndarray:
+        """Sum of squared errors of each row of augmented ``coefficients`` on this block."""
+
+        weights, intercepts = coefficients[:, :-1], coefficients[:, -1]
+        # Residuals split into a centred part and the constant offset at the block means.
+        offset = self.y_mean - weights @ self.x_mean - intercepts
+        quadratic = np.einsum("ki,ij,kj->k", weights, self.xx, weights)
+        centred = self.yy - 2 * weights @ self.xy + quadratic
+        return np.maximum(centred, 0.0) + self.n_samples * offset**2
+
+
+def _block_statistics(X: np.ndarray, y: np.ndarray, blocks: list[np.ndarray], n_jobs: int | None) -> list[RidgeStatistics]:
+    # NumPy releases the GIL inside matmul, so threads give real parallelism here.
+    return joblib.Parallel(n_jobs=n_jobs, prefer="threads")(
+        joblib.delayed(RidgeStatistics.from_rows)(X[rows], y[rows]) for rows in blocks
+    )
+
+
+def ridge_cross_validation(
+    X: np.ndarray | None = None,
+    y: np.ndarray | None = None,
+    alphas: Iterable[float] = (1.0,),
+    cv: model_selection.KFold | None = None,
+    n_jobs: int | None = None,
+) -> pd.DataFrame:
+    """Per-fold RMSE/MAE of ``Ridge(alpha)`` for every alpha, from shared block statistics.
+
+    Defaults to the diabetes data and the same shuffled 5-fold split used by
+    ``evaluate_with_cross_validation``.
+    """
+
+    X, y = _diabetes_arrays(X, y)
+    cv = cv or model_selection.KFold(n_splits=5, shuffle=True, random_state=42)
+    alphas = np.asarray(list(alphas), dtype=float)
+
+    test_blocks = [test for _, test in cv.split(X, y)]
+    block_stats = _block_statistics(X, y, test_blocks, n_jobs)
+    total = sum(block_stats[1:], block_stats[0])
+
+    rows = []
+    for fold, (test, held_out) in enumerate(zip(test_blocks, block_stats)):
+        coefficients = (total - held_out).solve(alphas)
+        errors = X[test] @ coefficients[:, :-1].T + coefficients[:, -1] - y[test][:, None]
+        rmse = np.sqrt((errors**2).mean(axis=0))
+        mae = np.abs(errors).mean(axis=0)
+        rows.extend({"alpha": alpha, "fold": fold, "rmse": r, "mae": m} for alpha, r, m in zip(alphas, rmse, mae))
+    return pd.DataFrame(rows)
+
+
+class LearningCurvePoint(NamedTuple):
+    """One row of a learning curve, averaged over the CV folds."""
+
+    train_size: int
+    train_rmse: float
+    validation_rmse: float
+
+
+def _learning_curve_splits(
+    X: np.ndarray, y: np.ndarray, train_sizes: Iterable[float], cv: int, random_state: int
+) -> tuple[list[tuple[np.ndarray, np.ndarray]], np.ndarray]:
+    # Same split and shuffling as sklearn.model_selection.learning_curve(shuffle=True).
+    splits = list(model_selection.check_cv(cv, y).split(X, y))
+    rng = np.random.RandomState(random_state)
+    splits = [(rng.permutation(train), test) for train, test in splits]
+    n_max = len(splits[0][0])
+    sizes = np.unique(np.clip((np.asarray(list(train_sizes)) * n_max).astype(int), 1, n_max))
+    return splits, sizes
+
+
+def _rmse_in_batches(model, X: np.ndarray, y: np.ndarray, rows: np.ndarray, batch_size: int) -> float:
+    squared_error = 0.0
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start : start + batch_size]
+        squared_error += float(np.sum((model.predict(X[batch]) - y[batch]) ** 2))
+    return float(np.sqrt(squared_error / len(rows)))
+
+
+def stream_learning_curve(
+    estimator=None,
+    X: np.ndarray | None = None,
+    y: np.ndarray | None = None,
+    train_sizes: Iterable[float] = np.linspace(0.1, 1.0, 5),
+    cv: int = 5,
+    random_state: int = 42,
+    n_jobs: int | None = None,
+    batch_size: int = 10_000,
+) -> Iterator[LearningCurvePoint]:
+    """Yield learning-curve points one at a time, each built on the previous prefix.
+
+    Each fold keeps a running model. Moving from one training size to the
+    next only feeds it the new chunk of rows, so a point costs the size of
+    the increment rather than a full refit, and each point is yielded as soon
+    as every fold has reached it.
+
+    ``estimator`` may be a ``Ridge`` (or ``None`` for ``Ridge(alpha=1.0)``),
+    updated through ``RidgeStatistics``, or any regressor with
+    ``partial_fit``. Training error for ``partial_fit`` models is evaluated
+    in batches of ``batch_size`` rows so no prefix is materialised at once.
+    """
+
+    X, y = _diabetes_arrays(X, y)
+    estimator = linear_model.Ridge(alpha=1.0) if estimator is None else estimator
+    use_statistics = isinstance(estimator, linear_model.Ridge)
+    if not use_statistics and not hasattr(estimator, "partial_fit"):
+        raise TypeError(f"{type(estimator).__name__} supports neither partial_fit nor sufficient-statistic updates")
+
+    splits, sizes = _learning_curve_splits(X, y, train_sizes, cv, random_state)
+    alphas = np.array([estimator.alpha]) if use_statistics else None
+    held_out = _block_statistics(X, y, [test for _, test in splits], n_jobs) if use_statistics else None
+    states: list = [None] * len(splits) if use_statistics else [sklearn_base.clone(estimator) for _ in splits]
+
+    previous = 0
+    for size in sizes:
+        chunks = [train[previous:size] for train, _ in splits]
+        train_rmse, validation_rmse = [], []
+        if use_statistics:
+            for fold, chunk_stats in enumerate(_block_statistics(X, y, chunks, n_jobs)):
+                states[fold] = chunk_stats if states[fold] is None else states[fold] + chunk_stats
+                coefficients = states[fold].solve(alphas)
+                train_rmse.append(np.sqrt(states[fold].sse(coefficients)[0] / size))
+                validation_rmse.append(np.sqrt(held_out[fold].sse(coefficients)[0] / held_out[fold].n_samples))
+        else:
+            for model, chunk, (train, test) in zip(states, chunks, splits):
+                model.partial_fit(X[chunk], y[chunk])
+                train_rmse.append(_rmse_in_batches(model, X, y, train[:size], batch_size))
+                validation_rmse.append(_rmse_in_batches(model, X, y, test, batch_size))
+        previous = size
+        yield LearningCurvePoint(int(size), float(np.mean(train_rmse)), float(np.mean(validation_rmse)))
+
+
+def ridge_learning_curve(
+    X: np.ndarray | None = None,
+    y: np.ndarray | None = None,
+    alpha: float = 1.0,
+    train_sizes: Iterable[float] = np.linspace(0.1, 1.0, 5),
+    cv: int = 5,
+    random_state: int = 42,
+    n_jobs: int | None = None,
+) -> pd.DataFrame:
+    """Learning curve for ``Ridge(alpha)`` matching ``compute_learning_curve``.
+
+    Collects ``stream_learning_curve``: a training prefix is the running sum
+    of its chunks' statistics and validation error comes from the held-out
+    block's statistics, so no model is ever refitted on raw rows.
+    """
+
+    points = stream_learning_curve(linear_model.Ridge(alpha=alpha), X, y, train_sizes, cv, random_state, n_jobs)
+    return pd.DataFrame(list(points), columns=list(LearningCurvePoint._fields))
+
+
 if __name__ == "__main__":
     cv_summary = evaluate_with_cross_validation()
     print("Cross-validation summary:\n", cv_summary)
 
     learning_curve_df = compute_learning_curve()
     print("Learning curve:\n", learning_curve_df)
+
+    # The sufficient-statistics engine reproduces both results and sweeps alphas almost for free.
+    fast_cv = ridge_cross_validation(alphas=[1.0])
+    assert np.allclose(fast_cv["rmse"], cv_summary["rmse"]) and np.allclose(fast_cv["mae"], cv_summary["mae"])
+    fast_curve = ridge_learning_curve()
+    assert np.allclose(fast_curve.to_numpy(), learning_curve_df.to_numpy())
+
+    for point in stream_learning_curve():
+        print(f"  streamed: {point.train_size:4d} samples – train RMSE {point.train_rmse:.2f}, validation RMSE {point.validation_rmse:.2f}")
+
+    alpha_sweep = ridge_cross_validation(alphas=np.logspace(-4, 2, 50)).groupby("alpha")["rmse"].mean()
+    print(f"Best alpha from a 50-value sweep: {alpha_sweep.idxmin():.4g} (RMSE {alpha_sweep.min():.2f})")
@@ -5,21 +5,62 @@ Learning outcomes
 - Build reusable feature engineering steps with scikit-learn pipelines.
 - Combine numerical and text features.
 - Understand feature union and custom transformers.
+
+Out-of-core fitting
+-------------------
+``FeaturePipelineBuilder.build_streaming`` returns a ``StreamingFeaturePipeline``
+that mirrors ``build()`` but is fitted with ``partial_fit`` over DataFrame
+chunks. It keeps only bounded summaries: a reservoir-sampled quantile sketch
+for each median, running mean/variance, per-column category counts, and
+hashed term and document frequencies from which the top ``max_features``
+terms and their IDF weights are chosen. Catalogues that do not fit in memory
+can then be fitted and transformed chunk by chunk.
+
+Stateless text features
+-----------------------
+``FeaturePipelineBuilder(..., text_vectorizer="hashing")`` swaps the
+TF-IDF + ``TextLengthTransformer`` union for ``HashingTextTransformer``,
+which tokenises each document once and emits hashed term counts, character
+length and token count in a single CSR matrix. Its benefit is bounded
+memory, not speed: there is no vocabulary to fit, so its state does not grow
+with the corpus and documents can be processed block by block or split across
+processes. On one process it runs within noise of the union, and because it
+keeps every token its output is larger than the 100-column TF-IDF's.
+
+Setting ``cache`` to a ``TransformCache`` memoises each branch of ``build()``
+keyed by fingerprints of its input columns (see ``lessons.transform_cache``).
+``output="sparse"`` keeps the result CSR end to end; ``transform_into`` from
+``lessons.preprocessing_output`` writes it into a preallocated float32 matrix.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Iterable, Iterator
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
+from scipy import sparse
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.compose import ColumnTransformer
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
 from sklearn.impute import SimpleImputer
 from sklearn.pipeline import FeatureUnion, Pipeline
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import OneHotEncoder, StandardScaler, normalize
+from sklearn.utils import murmurhash3_32
+
+try:
+    from lessons.preprocessing_output import sparse_threshold_for, transform_into
+    from lessons.transform_cache import CachedTransformer, TransformCache
+except ModuleNotFoundError:  # executed as ``python lessons/lesson06_feature_engineering.py``
+    from preprocessing_output import sparse_threshold_for, transform_into
+    from transform_cache import CachedTransformer, TransformCache
+
+TEXT_VECTORIZERS = ("tfidf", "hashing")
 
 
 def create_text_length_feature(text_series: pd.Series) -> np.ndarray:
@@ -38,6 +79,73 @@ class TextLengthTransformer(BaseEstimator, TransformerMixin):
         return create_text_length_feature(pd.Series(X))
 
 
+class _BucketCache(dict):
+    """Token -> hash bucket memo, so each distinct token in a block is hashed once."""
+
+    def __init__(self, n_features: int):
+        super().__init__()
+        self.n_features = n_features
+
+    def __missing__(self, token: str) -> int:
+        # Same bucket as FeatureHasher(alternate_sign=False): |murmurhash3_32(token)| mod n_features.
+        bucket = self[token] = abs(murmurhash3_32(token, seed=0)) % self.n_features
+        return bucket
+
+
+class HashingTextTransformer(BaseEstimator, TransformerMixin):
+    """Hashed token counts plus character length and token count, from one tokenisation.
+
+    Columns are ``n_features`` hashed term counts (L2-normalised when
+    ``norm="l2"``), followed by the character length and the number of
+    tokens of each document. Buckets match ``HashingVectorizer(alternate_sign=False)``.
+    The transformer is stateless and works through ``block_size`` documents
+    at a time, which bounds memory and lets ``n_jobs`` processes share the work.
+    It is not faster than the TF-IDF union on a single process; use it for
+    corpora whose vocabulary would not fit in memory, not for speed.
+    """
+
+    def __init__(
+        self,
+        n_features: int = 2**12,
+        norm: str | None = "l2",
+        token_pattern: str = r"(?u)\b\w\w+\b",
+        block_size: int = 50_000,
+        n_jobs: int | None = None,
+    ):
+        self.n_features = n_features
+        self.norm = norm
+        self.token_pattern = token_pattern
+        self.block_size = block_size
+        self.n_jobs = n_jobs
+
+    def fit(self, X: pd.Series, y: Iterable | None = None):
+        return self
+
+    def _transform_block(self, documents: list[str]) -> sparse.csr_matrix:
+        tokens = list(map(re.compile(self.token_pattern).findall, map(str.lower, documents)))
+        token_counts = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+        indptr = np.zeros(len(tokens) + 1, dtype=np.int64)
+        np.cumsum(token_counts, out=indptr[1:])
+        buckets = np.fromiter(
+            map(_BucketCache(self.n_features).__getitem__, chain.from_iterable(tokens)), dtype=np.int32, count=indptr[-1]
+        )
+        hashed = sparse.csr_matrix((np.ones(len(buckets)), buckets, indptr), shape=(len(tokens), self.n_features))
+        hashed.sum_duplicates()
+        if self.norm is not None:
+            hashed = normalize(hashed, norm=self.norm, copy=False)
+
+        stats = np.column_stack([np.fromiter(map(len, documents), dtype=float, count=len(documents)), token_counts])
+        return sparse.hstack([hashed, stats], format="csr")
+
+    def transform(self, X: pd.Series) -> sparse.csr_matrix:
+        documents = pd.Series(X).fillna("").astype(str).tolist()
+        blocks = Parallel(n_jobs=self.n_jobs)(
+            delayed(self._transform_block)(documents[start : start + self.block_size])
+            for start in range(0, max(len(documents), 1), self.block_size)
+        )
+        return sparse.vstack(blocks, format="csr")
+
+
 @dataclass
 class FeaturePipelineBuilder:
     """Factory for constructing complex preprocessing pipelines."""
@@ -45,6 +153,9 @@ class FeaturePipelineBuilder:
     numeric_features: list[str]
     categorical_features: list[str]
     text_feature: str
+    text_vectorizer: str = "tfidf"
+    cache: TransformCache | None = None
+    output: str = "default"
 
     def build(self) -> ColumnTransformer:
         numeric_transformer = Pipeline(
@@ -58,23 +169,222 @@ class FeaturePipelineBuilder:
             ]
         )
 
-        text_transformer = FeatureUnion(
-            transformer_list=[
-                ("tfidf", TfidfVectorizer(max_features=100)),
-                ("length", TextLengthTransformer()),
-            ]
-        )
+        if self.text_vectorizer == "hashing":
+            text_transformer = HashingTextTransformer()
+        elif self.text_vectorizer == "tfidf":
+            text_transformer = FeatureUnion(
+                transformer_list=[
+                    ("tfidf", TfidfVectorizer(max_features=100)),
+                    ("length", TextLengthTransformer()),
+                ]
+            )
+        else:
+            raise ValueError(f"Unknown text_vectorizer {self.text_vectorizer!r}; expected one of {TEXT_VECTORIZERS}")
+
+        if self.cache is not None:
+            numeric_transformer = CachedTransformer(numeric_transformer, self.cache)
+            categorical_transformer = CachedTransformer(categorical_transformer, self.cache)
+            text_transformer = CachedTransformer(text_transformer, self.cache)
 
         preprocessor = ColumnTransformer(
             transformers=[
                 ("num", numeric_transformer, self.numeric_features),
                 ("cat", categorical_transformer, self.categorical_features),
                 ("text", text_transformer, self.text_feature),
-            ]
+            ],
+            sparse_threshold=sparse_threshold_for(self.output),
         )
 
         return preprocessor
 
+    def build_streaming(
+        self,
+        max_features: int = 100,
+        n_hash_features: int = 2**18,
+        sketch_size: int = 10_000,
+        random_state: int = 0,
+    ) -> "StreamingFeaturePipeline":
+        """Return an out-of-core equivalent of ``build()`` fitted via ``partial_fit``."""
+
+        return StreamingFeaturePipeline(
+            numeric_features=self.numeric_features,
+            categorical_features=self.categorical_features,
+            text_feature=self.text_feature,
+            max_features=max_features,
+            n_hash_features=n_hash_features,
+            sketch_size=sketch_size,
+            random_state=random_state,
+        )
+
+
+@dataclass
+class ReservoirQuantileSketch:
+    """Bounded-memory quantile estimate from a uniform reservoir sample.
+
+    Exact while fewer than ``capacity`` values have been seen; afterwards the
+    reservoir is a uniform sample of the stream (Vitter's algorithm R).
+    """
+
+    capacity: int = 10_000
+    random_state: int = 0
+    n_seen: int = 0
+
+    def __post_init__(self) -> None:
+        self._sample = np.empty(self.capacity)
+        self._rng = np.random.default_rng(self.random_state)
+
+    def update(self, values: np.ndarray) -> None:
+        values = values[~np.isnan(values)]
+        free = min(self.capacity - self.n_seen, len(values)) if self.n_seen < self.capacity else 0
+        self._sample[self.n_seen : self.n_seen + free] = values[:free]
+        rest = values[free:]
+        if len(rest):
+            # Value number t (1-based) replaces a random slot with probability capacity / t.
+            positions = self.n_seen + free + np.arange(1, len(rest) + 1)
+            slots = (self._rng.random(len(rest)) * positions).astype(np.int64)
+            keep = slots < self.capacity
+            self._sample[slots[keep]] = rest[keep]
+        self.n_seen += len(values)
+
+    def quantile(self, q: float) -> float:
+        filled = self._sample[: min(self.n_seen, self.capacity)]
+        return float(np.quantile(filled, q)) if len(filled) else float("nan")
+
+
+@dataclass
+class _RunningMoments:
+    """Count, mean and sum of squared deviations (Chan et al. parallel update)."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def merge(self, count: int, mean: float, m2: float) -> None:
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+
+
+@dataclass
+class StreamingFeaturePipeline:
+    """Chunk-wise counterpart of ``FeaturePipelineBuilder.build()``.
+
+    Numeric columns are median-imputed and standardised, categorical columns
+    are most-frequent-imputed and one-hot encoded (unknown categories are
+    ignored), and the text column becomes L2-normalised TF-IDF over the
+    ``max_features`` most frequent hashed terms plus its character length.
+    Text columns are ordered by hash bucket rather than alphabetically, and
+    hash collisions can make the text block differ slightly from
+    ``TfidfVectorizer``; otherwise the output matches ``build()`` exactly
+    while the sample count stays within ``sketch_size``.
+    """
+
+    numeric_features: list[str]
+    categorical_features: list[str]
+    text_feature: str
+    max_features: int = 100
+    n_hash_features: int = 2**18
+    sketch_size: int = 10_000
+    random_state: int = 0
+    n_samples_seen_: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        self._sketches = {
+            name: ReservoirQuantileSketch(self.sketch_size, self.random_state + i)
+            for i, name in enumerate(self.numeric_features)
+        }
+        self._moments = {name: _RunningMoments() for name in self.numeric_features}
+        self._category_counts: dict[str, Counter] = {name: Counter() for name in self.categorical_features}
+        self._hasher = HashingVectorizer(n_features=self.n_hash_features, alternate_sign=False, norm=None)
+        self._term_counts = np.zeros(self.n_hash_features, dtype=np.int64)
+        self._document_counts = np.zeros(self.n_hash_features, dtype=np.int64)
+        self._fitted = False
+
+    def partial_fit(self, chunk: pd.DataFrame) -> "StreamingFeaturePipeline":
+        for name in self.numeric_features:
+            values = chunk[name].to_numpy(dtype=float)
+            self._sketches[name].update(values)
+            present = values[~np.isnan(values)]
+            if len(present):
+                self._moments[name].merge(len(present), float(present.mean()), float(((present - present.mean()) ** 2).sum()))
+        for name in self.categorical_features:
+            self._category_counts[name].update(chunk[name].dropna().value_counts().to_dict())
+
+        counts = self._hasher.transform(chunk[self.text_feature].fillna(""))
+        self._term_counts += np.asarray(counts.sum(axis=0), dtype=np.int64).ravel()
+        self._document_counts += np.bincount(counts.indices, minlength=self.n_hash_features)
+        self.n_samples_seen_ += len(chunk)
+        self._fitted = False
+        return self
+
+    def fit(self, chunks: Iterable[pd.DataFrame]) -> "StreamingFeaturePipeline":
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        return self._finalise()
+
+    def _finalise(self) -> "StreamingFeaturePipeline":
+        n = self.n_samples_seen_
+        self.medians_ = {}
+        self.means_ = {}
+        self.scales_ = {}
+        for name in self.numeric_features:
+            median = self._sketches[name].quantile(0.5)
+            moments = _RunningMoments(**vars(self._moments[name]))
+            # Imputed rows all take the median value, which only becomes known now.
+            moments.merge(n - moments.count, median, 0.0)
+            std = np.sqrt(moments.m2 / n)
+            self.medians_[name], self.means_[name], self.scales_[name] = median, moments.mean, std if std > 0 else 1.0
+
+        self.most_frequent_ = {}
+        self.categories_ = {}
+        for name, counts in self._category_counts.items():
+            # SimpleImputer breaks ties by the smallest value.
+            self.most_frequent_[name] = min(counts, key=lambda value: (-counts[value], value))
+            self.categories_[name] = sorted(counts)
+
+        n_terms = min(self.max_features, int(np.count_nonzero(self._term_counts)))
+        top = np.argsort(-self._term_counts, kind="stable")[:n_terms]
+        self.term_columns_ = np.sort(top)
+        self.idf_ = np.log((1 + n) / (1 + self._document_counts[self.term_columns_])) + 1
+        self._fitted = True
+        return self
+
+    def transform(self, chunk: pd.DataFrame) -> sparse.csr_matrix:
+        if not self._fitted:
+            self._finalise()
+
+        numeric = np.empty((len(chunk), len(self.numeric_features)))
+        for j, name in enumerate(self.numeric_features):
+            values = chunk[name].fillna(self.medians_[name]).to_numpy(dtype=float)
+            numeric[:, j] = (values - self.means_[name]) / self.scales_[name]
+
+        one_hot = []
+        for name in self.categorical_features:
+            categories = self.categories_[name]
+            codes = pd.Categorical(chunk[name].fillna(self.most_frequent_[name]), categories=categories).codes
+            known = codes >= 0
+            rows = np.flatnonzero(known)
+            one_hot.append(
+                sparse.csr_matrix((np.ones(len(rows)), (rows, codes[known])), shape=(len(chunk), len(categories)))
+            )
+
+        text = chunk[self.text_feature].fillna("")
+        tfidf = self._hasher.transform(text)[:, self.term_columns_].multiply(self.idf_).tocsr()
+        norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        tfidf = sparse.diags(1 / norms) @ tfidf
+        length = create_text_length_feature(text)
+
+        return sparse.hstack([sparse.csr_matrix(numeric), *one_hot, tfidf, sparse.csr_matrix(length)], format="csr")
+
+    def transform_chunks(self, chunks: Iterable[pd.DataFrame]) -> Iterator[sparse.csr_matrix]:
+        for chunk in chunks:
+            yield self.transform(chunk)
+
 
 if __name__ == "__main__":
     data = pd.DataFrame(
@@ -100,3 +410,15 @@ if __name__ == "__main__":
     pipeline = builder.build()
     transformed = pipeline.fit_transform(data, None)
     print("Transformed shape:", transformed.shape)
+
+    # The same features fitted out of core, two rows at a time.
+    streaming = builder.build_streaming().fit(data.iloc[i : i + 2] for i in range(0, len(data), 2))
+    streamed = sparse.vstack(list(streaming.transform_chunks(data.iloc[i : i + 2] for i in range(0, len(data), 2))))
+    print("Streamed shape:", streamed.shape)
+
+    hashed = FeaturePipelineBuilder(["price", "rating"], ["category"], "description", text_vectorizer="hashing")
+    print("Hashed shape:", hashed.build().fit_transform(data).shape)
+
+    sparse_builder = FeaturePipelineBuilder(["price", "rating"], ["category"], "description", output="sparse")
+    fitted = sparse_builder.build().fit(data)
+    print("float32 shape:", transform_into(fitted, data).shape)
@@ -3,43 +3,353 @@
 We explore clustering and dimensionality reduction using scikit-learn. The
 lesson highlights practical tips for choosing the number of clusters and for
 interpreting principal components.
+
+Clustering large datasets
+-------------------------
+``perform_clustering(mode="minibatch")`` fits ``MiniBatchKMeans`` by feeding
+it ``batch_size`` rows at a time, so the model never needs more than one
+batch of working memory. The silhouette is computed by ``chunked_silhouette``,
+which walks the pairwise distances a block of rows at a time (bounded by
+``working_memory_mb``), can restrict the rows it scores to a stratified
+sample, and spreads the blocks over ``n_jobs`` worker processes. Scoring a
+sample of ``s`` rows against all ``n`` points costs ``O(s * n)`` instead of
+``O(n ** 2)``.
+
+``sweep_clusters`` chooses ``k``: it standardises the data once, warm-starts
+each ``k`` from the previous centroids by splitting the largest cluster, and
+scores every ``k`` against one cached block of pairwise distances.
+
+Dimensionality reduction at scale
+---------------------------------
+``reduce_dimensions(mode="randomized")`` finds only the top components with
+a randomized SVD, and ``mode="incremental"`` fits ``IncrementalPCA`` one
+chunk at a time (``fit_incremental_pca`` does the same for any iterator of
+chunks). ``project_into`` then writes the projection chunk by chunk into a
+preallocated ``float32`` array, which the returned DataFrame wraps without
+copying.
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from typing import Iterable
+
 import numpy as np
-import pandas as pd
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
-from sklearn.datasets import load_iris
-from sklearn.metrics import silhouette_score
 
+try:
+    from lessons._lazy import lazy_import
+    from lessons.dataset_registry import get_dataset
+except ModuleNotFoundError:  # executed as ``python lessons/lesson07_unsupervised_learning.py``
+    from _lazy import lazy_import
+    from dataset_registry import get_dataset
+
+pd = lazy_import("pandas")
+joblib = lazy_import("joblib")
+cluster = lazy_import("sklearn.cluster")
+decomposition = lazy_import("sklearn.decomposition")
+metrics = lazy_import("sklearn.metrics")
+preprocessing = lazy_import("sklearn.preprocessing")
+
+CLUSTERING_MODES = ("full", "minibatch")
+REDUCTION_MODES = ("exact", "randomized", "incremental")
+
+
+def _silhouette_from_sums(sums: np.ndarray, own: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Silhouette of each row given its summed distance to every cluster."""
+
+    own_counts = counts[own]
+    a = sums[np.arange(len(own)), own] / np.maximum(own_counts - 1, 1)
+    means = sums / counts
+    means[np.arange(len(own)), own] = np.inf
+    b = means.min(axis=1)
+    scores = (b - a) / np.maximum(a, b)
+    # Singleton clusters score 0, as in ``sklearn.metrics.silhouette_samples``.
+    return np.where(own_counts > 1, np.nan_to_num(scores), 0.0)
+
+
+def _silhouette_block(
+    X: np.ndarray, squared_norms: np.ndarray, membership: np.ndarray, codes: np.ndarray, rows: np.ndarray
+) -> np.ndarray:
+    # Summed distance from each row to every cluster: one (block x n) @ (n x k) product.
+    sums = metrics.pairwise.euclidean_distances(X[rows], X, Y_norm_squared=squared_norms) @ membership
+    return _silhouette_from_sums(sums, codes[rows], membership.sum(axis=0))
+
+
+def _stratified_sample(codes: np.ndarray, counts: np.ndarray, sample_size: int, rng: np.random.Generator) -> np.ndarray:
+    quotas = np.maximum(1, np.round(sample_size * counts / counts.sum()).astype(int))
+    members = [np.flatnonzero(codes == c) for c in range(len(counts))]
+    return np.concatenate([rng.choice(rows, size=min(quota, len(rows)), replace=False) for rows, quota in zip(members, quotas)])
+
+
+def chunked_silhouette(
+    X: np.ndarray,
+    labels: np.ndarray,
+    sample_size: int | None = None,
+    working_memory_mb: int = 64,
+    n_jobs: int | None = None,
+    random_state: int | None = 0,
+) -> float:
+    """Mean silhouette coefficient computed over blocks of rows with bounded memory.
+
+    Parameters
+    ----------
+    X, labels:
+        Data and cluster assignments.
+    sample_size:
+        When given, only a stratified sample of about this many rows is
+        scored (against all ``n`` points), and per-cluster means are weighted
+        by cluster size. ``None`` scores every row and matches
+        ``sklearn.metrics.silhouette_score``.
+    working_memory_mb:
+        Upper bound for one block of the distance matrix.
+    n_jobs:
+        Worker processes the blocks are spread over.
+    """
+
+    X = np.asarray(X, dtype=np.float64)
+    _, codes, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    if len(counts) < 2 or len(counts) > len(X) - 1:
+        raise ValueError(f"Number of labels is {len(counts)}. Valid values are 2 to n_samples - 1 (inclusive)")
+
+    if sample_size is None:
+        rows = np.arange(len(X))
+    else:
+        rows = _stratified_sample(codes, counts, sample_size, np.random.default_rng(random_state))
+    membership = np.zeros((len(X), len(counts)))
+    membership[np.arange(len(X)), codes] = 1.0
+    squared_norms = np.einsum("ij,ij->i", X, X)[np.newaxis, :]
+
+    block = max(1, working_memory_mb * 2**20 // (8 * len(X)))
+    scores = np.concatenate(
+        joblib.Parallel(n_jobs=n_jobs)(
+            joblib.delayed(_silhouette_block)(X, squared_norms, membership, codes, rows[start : start + block])
+            for start in range(0, len(rows), block)
+        )
+    )
+    if sample_size is None:
+        return float(scores.mean())
+    sampled_codes = codes[rows]
+    cluster_means = np.array([scores[sampled_codes == c].mean() for c in range(len(counts))])
+    return float(np.dot(cluster_means, counts / counts.sum()))
+
+
+def _minibatch_kmeans(X: np.ndarray, k: int, batch_size: int, random_state: int) -> cluster.MiniBatchKMeans:
+    model = cluster.MiniBatchKMeans(n_clusters=k, batch_size=batch_size, random_state=random_state, n_init="auto")
+    order = np.random.default_rng(random_state).permutation(len(X))
+    # partial_fit initialises from its first call, so that batch must hold at least k rows.
+    first = max(batch_size, 3 * k)
+    model.partial_fit(X[order[:first]])
+    for start in range(first, len(X), batch_size):
+        model.partial_fit(X[order[start : start + batch_size]])
+    return model
+
+
+def perform_clustering(
+    k: int = 3,
+    data: np.ndarray | None = None,
+    mode: str = "full",
+    batch_size: int = 1024,
+    silhouette_sample: int | None = None,
+    n_jobs: int | None = None,
+) -> dict[str, float]:
+    """Cluster the Iris dataset (or ``data``) and compute the silhouette score.
+
+    ``mode="minibatch"`` fits in ``batch_size`` mini-batches; the silhouette is
+    estimated chunk-wise, on a stratified ``silhouette_sample`` when given,
+    using ``n_jobs`` processes.
+    """
+
+    if mode not in CLUSTERING_MODES:
+        raise ValueError(f"Unknown clustering mode {mode!r}; expected one of {CLUSTERING_MODES}")
+    X = get_dataset("iris").data if data is None else np.asarray(data, dtype=np.float64)
+
+    if mode == "full":
+        model = cluster.KMeans(n_clusters=k, random_state=42, n_init="auto")
+        labels = model.fit_predict(X)
+        inertia = float(model.inertia_)
+    else:
+        model = _minibatch_kmeans(X, k, batch_size, random_state=42)
+        labels, distances = metrics.pairwise_distances_argmin_min(X, model.cluster_centers_)
+        inertia = float(np.dot(distances, distances))
+
+    score = chunked_silhouette(X, labels, sample_size=silhouette_sample, n_jobs=n_jobs)
+    return {"inertia": inertia, "silhouette": score}
+
+
+@dataclass
+class ClusterSweepResult:
+    """Inertia and silhouette for every ``k`` of a ``sweep_clusters`` run."""
+
+    table: pd.DataFrame
+    best_k: int
+
+
+def _split_largest_cluster(X: np.ndarray, centers: np.ndarray, labels: np.ndarray, random_state: int) -> np.ndarray:
+    largest = np.bincount(labels, minlength=len(centers)).argmax()
+    halves = cluster.KMeans(n_clusters=2, n_init=1, random_state=random_state).fit(X[labels == largest])
+    return np.vstack([np.delete(centers, largest, axis=0), halves.cluster_centers_])
+
+
+def _sweep_silhouette(distances: np.ndarray, rows: np.ndarray, labels: np.ndarray) -> float:
+    counts = np.bincount(labels)
+    membership = np.zeros((len(labels), len(counts)))
+    membership[np.arange(len(labels)), labels] = 1.0
+    return float(_silhouette_from_sums(distances @ membership, labels[rows], counts).mean())
+
+
+def sweep_clusters(
+    data: np.ndarray | None = None,
+    k_range: Iterable[int] = range(2, 11),
+    standardise: bool = True,
+    working_memory_mb: int = 256,
+    n_jobs: int | None = None,
+    random_state: int = 42,
+) -> ClusterSweepResult:
+    """Fit KMeans for every ``k`` in ``k_range`` and pick the best by silhouette.
+
+    The data (Iris by default) is loaded and standardised once. The smallest
+    ``k`` is fitted from scratch; every following ``k`` starts from the
+    previous centroids with the largest cluster split in two, and needs only
+    a single warm-started refinement. Distances from a fixed set of rows to
+    all rows are computed once and shared by every ``k``: all rows while the
+    ``n x n`` matrix fits in ``working_memory_mb`` (exact silhouettes),
+    otherwise a uniform sample that does. The per-``k`` silhouettes then run
+    in ``n_jobs`` processes.
+    """
+
+    X = get_dataset("iris").data if data is None else np.asarray(data, dtype=np.float64)
+    if standardise:
+        X = preprocessing.StandardScaler().fit_transform(X)
+    k_values = sorted(set(k_range))
+    if k_values[0] < 2:
+        raise ValueError("k_range must start at 2 or more clusters")
+
+    fits = []
+    model = cluster.KMeans(n_clusters=k_values[0], random_state=random_state, n_init="auto").fit(X)
+    fits.append((k_values[0], model.inertia_, model.labels_))
+    for k in k_values[1:]:
+        centers, labels = model.cluster_centers_, model.labels_
+        while len(centers) < k:
+            centers = _split_largest_cluster(X, centers, labels, random_state)
+            labels = metrics.pairwise_distances_argmin_min(X, centers)[0]
+        model = cluster.KMeans(n_clusters=k, init=centers, n_init=1, random_state=random_state).fit(X)
+        fits.append((k, model.inertia_, model.labels_))
+
+    n_rows = min(len(X), max(1, working_memory_mb * 2**20 // (8 * len(X))))
+    if n_rows == len(X):
+        rows = np.arange(len(X))
+    else:
+        rows = np.sort(np.random.default_rng(random_state).choice(len(X), n_rows, replace=False))
+    distances = metrics.pairwise.euclidean_distances(X[rows], X)
+    silhouettes = joblib.Parallel(n_jobs=n_jobs)(
+        joblib.delayed(_sweep_silhouette)(distances, rows, labels) for _, _, labels in fits
+    )
+
+    table = pd.DataFrame(
+        {"k": [k for k, _, _ in fits], "inertia": [float(inertia) for _, inertia, _ in fits], "silhouette": silhouettes}
+    )
+    # idxmax keeps the smallest k among ties.
+    return ClusterSweepResult(table=table, best_k=int(table.loc[table["silhouette"].idxmax(), "k"]))
+
+
+def fit_incremental_pca(chunks: Iterable[np.ndarray], n_components: int) -> decomposition.IncrementalPCA:
+    """Fit ``IncrementalPCA`` with one ``partial_fit`` per chunk (each needs >= ``n_components`` rows)."""
+
+    pca = decomposition.IncrementalPCA(n_components=n_components)
+    for chunk in chunks:
+        pca.partial_fit(chunk)
+    return pca
+
+
+def project_into(
+    pca: decomposition.PCA | decomposition.IncrementalPCA,
+    X: np.ndarray | Iterable[np.ndarray],
+    out: np.ndarray | None = None,
+    chunk_size: int = 10_000,
+) -> np.ndarray:
+    """Write ``pca.transform(X)`` into ``out`` (a new float32 array by default), chunk by chunk.
+
+    ``X`` may also be an iterable of chunks, in which case ``out`` must be
+    preallocated with one row per input row.
+    """
+
+    if isinstance(X, np.ndarray):
+        if out is None:
+            out = np.empty((len(X), pca.n_components_), dtype=np.float32)
+        chunks: Iterable[np.ndarray] = (X[start : start + chunk_size] for start in range(0, len(X), chunk_size))
+    elif out is None:
+        raise ValueError("project_into needs a preallocated out array when X is an iterable of chunks")
+    else:
+        chunks = X
+
+    components = pca.components_.T
+    if getattr(pca, "whiten", False):
+        components = components / np.sqrt(pca.explained_variance_)
+    offset = pca.mean_ @ components
+    row = 0
+    for chunk in chunks:
+        block = out[row : row + len(chunk)]
+        # (chunk - mean) @ components, without materialising the centred chunk.
+        np.subtract(chunk @ components, offset, out=block, casting="same_kind")
+        row += len(chunk)
+    if row != len(out):
+        raise ValueError(f"out has {len(out)} rows but {row} rows were projected")
+    return out
 
-def perform_clustering(k: int = 3) -> dict[str, float]:
-    """Cluster the Iris dataset and compute the silhouette score."""
 
-    data = load_iris()
-    model = KMeans(n_clusters=k, random_state=42, n_init="auto")
-    labels = model.fit_predict(data.data)
-    score = float(silhouette_score(data.data, labels))
-    return {"inertia": float(model.inertia_), "silhouette": score}
+def reduce_dimensions(
+    n_components: int = 2,
+    data: np.ndarray | None = None,
+    target: np.ndarray | None = None,
+    mode: str = "exact",
+    batch_size: int = 10_000,
+    out: np.ndarray | None = None,
+) -> pd.DataFrame:
+    """Return the Iris dataset (or ``data``) projected onto principal components.
 
+    Parameters
+    ----------
+    mode:
+        ``"exact"`` (full SVD), ``"randomized"`` (randomized SVD of the top
+        ``n_components``) or ``"incremental"`` (``IncrementalPCA`` over
+        ``batch_size``-row chunks).
+    out:
+        Preallocated ``(n_samples, n_components)`` array to project into. The
+        scalable modes allocate a float32 one when omitted; the exact mode
+        then keeps ``PCA.fit_transform``'s float64 output.
+    """
 
-def reduce_dimensions(n_components: int = 2) -> pd.DataFrame:
-    """Return the Iris dataset projected onto principal components."""
+    if mode not in REDUCTION_MODES:
+        raise ValueError(f"Unknown reduction mode {mode!r}; expected one of {REDUCTION_MODES}")
+    if data is None:
+        iris = get_dataset("iris")
+        data, target = iris.data, iris.target
 
-    data = load_iris()
-    pca = PCA(n_components=n_components, random_state=42)
-    components = pca.fit_transform(data.data)
+    if mode == "exact" and out is None:
+        components = decomposition.PCA(n_components=n_components, random_state=42).fit_transform(data)
+    else:
+        if mode == "incremental":
+            chunks = (data[start : start + batch_size] for start in range(0, len(data), batch_size))
+            pca = fit_incremental_pca(chunks, n_components)
+        else:
+            solver = "randomized" if mode == "randomized" else "auto"
+            pca = decomposition.PCA(n_components=n_components, svd_solver=solver, random_state=42).fit(data)
+        components = project_into(pca, data, out, chunk_size=batch_size)
 
-    projected = pd.DataFrame(components, columns=[f"PC{i+1}" for i in range(n_components)])
-    projected["target"] = data.target
+    projected = pd.DataFrame(components, columns=[f"PC{i+1}" for i in range(n_components)], copy=False)
+    if target is not None:
+        projected["target"] = target
     return projected
 
 
 if __name__ == "__main__":
     clustering_metrics = perform_clustering()
     print("Clustering metrics:", clustering_metrics)
+    print("Mini-batch metrics:", perform_clustering(mode="minibatch", batch_size=32, silhouette_sample=60))
+    sweep = sweep_clusters(k_range=range(2, 8))
+    print(f"Cluster sweep (best k={sweep.best_k}):\n", sweep.table)
 
     projected_df = reduce_dimensions()
     print("Projected data head:\n", projected_df.head())
+    print("Randomized PCA head:\n", reduce_dimensions(mode="randomized").head(2))
+    print("Incremental PCA head:\n", reduce_dimensions(mode="incremental", batch_size=50).head(2))
@@ -3,22 +3,54 @@
 In this module we focus on the operational side of machine learning:
 packaging models, creating prediction services, and monitoring drift.
 The code snippets illustrate lightweight patterns using FastAPI.
+
+Serving tips
+------------
+- Scoring one row at a time spends most of the request in Python overhead.
+  ``MicroBatcher`` queues concurrent requests and scores them with a single
+  vectorised ``predict`` call; enable it with ``ML_LESSON_MICRO_BATCHING=1``.
+- ``/predict_batch`` accepts many feature rows at once and ``/metrics``
+  exposes queue-depth, batch-size and latency counters for scraping.
+- ``ModelRegistry`` loads (or trains) the model on a background thread so the
+  server starts immediately; ``/ready`` reports when it can serve traffic.
+  The registry also watches the artifact and hot-swaps newer versions.
+- Pointing ``ML_LESSON_MODEL_PATH`` at a ``.mmap`` file stores the model as
+  raw aligned arrays (see ``lessons.artifacts``); every worker process then
+  memory-maps the same pages instead of unpickling its own copy.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Callable, Sequence
 
-import joblib
 import numpy as np
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-from sklearn.datasets import load_diabetes
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
 
-MODEL_PATH = Path("models/linear_regression_diabetes.joblib")
+try:
+    from lessons._lazy import lazy_import
+    from lessons.artifacts import MAPPED_ARTIFACT_SUFFIX, is_mapped_artifact, load_arrays, save_arrays
+    from lessons.dataset_registry import get_dataset
+except ModuleNotFoundError:  # executed as ``python lessons/lesson09_model_deployment.py``
+    from _lazy import lazy_import
+    from artifacts import MAPPED_ARTIFACT_SUFFIX, is_mapped_artifact, load_arrays, save_arrays
+    from dataset_registry import get_dataset
+
+# FastAPI and pydantic define the app and schemas at import time; scikit-learn
+# is only needed once a model is trained or loaded.
+joblib = lazy_import("joblib")
+linear_model = lazy_import("sklearn.linear_model")
+model_selection = lazy_import("sklearn.model_selection")
+
+MODEL_PATH = Path(os.getenv("ML_LESSON_MODEL_PATH", "models/linear_regression_diabetes.joblib"))
 
 
 @dataclass
@@ -27,14 +59,38 @@ class ModelTrainer:
 
     model_path: Path = MODEL_PATH
 
-    def train_and_save(self) -> None:
-        data = load_diabetes()
-        X_train, X_test, y_train, y_test = train_test_split(data.data, data.target, test_size=0.2, random_state=42)
+    def train_and_save(
+        self, X: np.ndarray | None = None, y: np.ndarray | None = None, feature_names: Sequence[str] | None = None
+    ) -> None:
+        """Fit on the diabetes data (or ``X``/``y``) and write the artifact to ``model_path``."""
 
-        model = LinearRegression()
+        if X is None or y is None:
+            data = get_dataset("diabetes")
+            X, y, feature_names = data.data, data.target, data.feature_names
+        elif feature_names is None:
+            feature_names = [f"x{i}" for i in range(X.shape[1])]
+        X_train, X_test, y_train, y_test = model_selection.train_test_split(X, y, test_size=0.2, random_state=42)
+
+        model = linear_model.LinearRegression()
         model.fit(X_train, y_train)
+        if self.model_path.suffix == MAPPED_ARTIFACT_SUFFIX:
+            arrays = {"coef": model.coef_, "intercept": np.atleast_1d(model.intercept_)}
+            metadata = {"model_type": "LinearRegression", "feature_names": list(feature_names)}
+            save_arrays(self.model_path, arrays, metadata)
+            return
+
         self.model_path.parent.mkdir(parents=True, exist_ok=True)
-        joblib.dump({"model": model, "feature_names": data.feature_names}, self.model_path)
+        # Write to a uniquely named temporary file first so watchers never see a
+        # partial artifact and concurrent trainers never truncate each other's.
+        with tempfile.NamedTemporaryFile(
+            dir=self.model_path.parent, prefix=self.model_path.name, suffix=".tmp", delete=False
+        ) as handle:
+            try:
+                joblib.dump({"model": model, "feature_names": list(feature_names)}, handle)
+            except BaseException:
+                os.unlink(handle.name)
+                raise
+        os.replace(handle.name, self.model_path)
 
 
 class PredictionRequest(BaseModel):
@@ -49,39 +105,373 @@ class PredictionResponse(BaseModel):
     prediction: float
 
 
+class BatchPredictionRequest(BaseModel):
+    """Schema for scoring many feature rows in one request."""
+
+    instances: list[list[float]]
+
+
+class BatchPredictionResponse(BaseModel):
+    """Schema for batched model predictions."""
+
+    predictions: list[float]
+
+
+def _load_mapped_linear_model(model_path: Path) -> dict[str, object]:
+    """Rebuild a ``LinearRegression`` whose coefficients are read-only memory maps."""
+
+    artifact = load_arrays(model_path)
+    model = linear_model.LinearRegression()
+    model.coef_ = artifact.arrays["coef"]
+    model.intercept_ = float(artifact.arrays["intercept"][0])
+    model.n_features_in_ = model.coef_.shape[-1]
+    return {"model": model, "feature_names": artifact.metadata["feature_names"]}
+
+
 class ModelService:
     """Lightweight service wrapper around a scikit-learn model."""
 
     def __init__(self, model_path: Path = MODEL_PATH) -> None:
-        self.model_artifact = joblib.load(model_path)
-        self.model: LinearRegression = self.model_artifact["model"]
+        if is_mapped_artifact(model_path):
+            self.model_artifact = _load_mapped_linear_model(model_path)
+        else:
+            self.model_artifact = joblib.load(model_path)
+        self.model: linear_model.LinearRegression = self.model_artifact["model"]
         self.feature_names = self.model_artifact["feature_names"]
 
+    def check_width(self, rows: Sequence[Sequence[float]]) -> None:
+        """Raise ``ValueError`` unless every row has the model's number of features."""
+
+        expected = self.model.n_features_in_
+        widths = sorted({len(row) for row in rows})
+        if widths and widths != [expected]:
+            raise ValueError(f"Expected {expected} features per row, got rows of length {widths}")
+
     def predict(self, features: list[float]) -> float:
         array = np.array(features).reshape(1, -1)
         return float(self.model.predict(array)[0])
 
+    def predict_matrix(self, matrix: np.ndarray) -> np.ndarray:
+        """Score a 2-D feature matrix with a single vectorised call."""
+
+        return self.model.predict(matrix)
+
+    def predict_batch(self, rows: Sequence[Sequence[float]]) -> list[float]:
+        if not rows:
+            return []
+        self.check_width(rows)
+        return self.predict_matrix(np.asarray(rows, dtype=float)).tolist()
+
+
+@dataclass
+class BatchingConfig:
+    """Settings that control how requests are merged into batches."""
+
+    enabled: bool = False
+    max_batch_size: int = 64
+    max_wait_ms: float = 2.0
+
+    @classmethod
+    def from_env(cls) -> "BatchingConfig":
+        return cls(
+            enabled=os.getenv("ML_LESSON_MICRO_BATCHING", "0") == "1",
+            max_batch_size=int(os.getenv("ML_LESSON_MAX_BATCH_SIZE", cls.max_batch_size)),
+            max_wait_ms=float(os.getenv("ML_LESSON_MAX_WAIT_MS", cls.max_wait_ms)),
+        )
+
+
+@dataclass
+class BatchingMetrics:
+    """Counters describing the behaviour of a ``MicroBatcher``."""
+
+    requests: int = 0
+    batches: int = 0
+    max_batch_size_seen: int = 0
+    latency_ms_total: float = 0.0
+    latency_ms_max: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_batch(self, size: int, latencies_ms: Sequence[float]) -> None:
+        with self._lock:
+            self.requests += size
+            self.batches += 1
+            self.max_batch_size_seen = max(self.max_batch_size_seen, size)
+            self.latency_ms_total += sum(latencies_ms)
+            self.latency_ms_max = max(self.latency_ms_max, max(latencies_ms))
+
+    def snapshot(self, queue_depth: int) -> dict[str, float]:
+        with self._lock:
+            return {
+                "queue_depth": queue_depth,
+                "requests_total": self.requests,
+                "batches_total": self.batches,
+                "batch_size_mean": self.requests / self.batches if self.batches else 0.0,
+                "batch_size_max": self.max_batch_size_seen,
+                "latency_ms_mean": self.latency_ms_total / self.requests if self.requests else 0.0,
+                "latency_ms_max": self.latency_ms_max,
+            }
+
+
+@dataclass
+class _PendingPrediction:
+    features: np.ndarray
+    future: Future
+    enqueued_at: float
+
+
+class MicroBatcher:
+    """Merge concurrent single-row requests into one vectorised prediction.
+
+    Callers block in ``submit`` while a background thread collects up to
+    ``max_batch_size`` rows (or waits at most ``max_wait_ms`` after the first
+    row arrives), stacks them into a matrix and calls ``predict_fn`` once.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.metrics = BatchingMetrics()
+        self._queue: queue.Queue[_PendingPrediction | None] = queue.Queue()
+        self._worker: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+            self._worker.start()
+
+    def stop(self) -> None:
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def submit(self, features: Sequence[float]) -> float:
+        """Queue a single row and block until its prediction is ready."""
+
+        if self._worker is None:
+            raise RuntimeError("MicroBatcher has not been started")
+        pending = _PendingPrediction(np.asarray(features, dtype=float), Future(), time.perf_counter())
+        self._queue.put(pending)
+        return float(pending.future.result())
+
+    def snapshot(self) -> dict[str, float]:
+        return self.metrics.snapshot(queue_depth=self._queue.qsize())
+
+    def _collect(self, first: _PendingPrediction) -> tuple[list[_PendingPrediction], bool]:
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _score(self, batch: list[_PendingPrediction]) -> None:
+        try:
+            predictions = self.predict_fn(np.vstack([item.features for item in batch]))
+        except Exception:
+            # One malformed row must not fail its neighbours: rescore row by row
+            # so every caller gets its own result or its own error.
+            predictions = []
+            for item in batch:
+                try:
+                    predictions.append(self.predict_fn(item.features.reshape(1, -1))[0])
+                except Exception as exc:
+                    predictions.append(exc)
+
+        finished = time.perf_counter()
+        for item, prediction in zip(batch, predictions):
+            if isinstance(prediction, Exception):
+                item.future.set_exception(prediction)
+            else:
+                item.future.set_result(prediction)
+        self.metrics.record_batch(len(batch), [(finished - item.enqueued_at) * 1000 for item in batch])
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stop_requested = self._collect(first)
+            self._score(batch)
+            if stop_requested:
+                return
+
+
+class ModelRegistry:
+    """Hold the live ``ModelService`` and replace it without blocking requests.
+
+    Loading happens on background threads. A new ``ModelService`` is fully
+    constructed before it is published, and publishing is a single reference
+    assignment, so request handlers that read ``registry.service`` always see
+    either the old or the new model and never wait on a load.
+    """
+
+    def __init__(self, model_path: Path = MODEL_PATH, poll_interval: float = 2.0) -> None:
+        self.model_path = model_path
+        self.poll_interval = poll_interval
+        self.service: ModelService | None = None
+        self.version = 0
+        self.last_error: str | None = None
+        self._attempted_mtime: int | None = None
+        self._initial_attempted = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def ready(self) -> bool:
+        return self.service is not None
+
+    def start(self) -> None:
+        """Begin loading in the background and, optionally, watching for updates."""
+
+        self._stop.clear()
+        targets = [self._initial_load]
+        if self.poll_interval > 0:
+            targets.append(self._watch)
+        for target in targets:
+            thread = threading.Thread(target=target, name=f"model-registry-{target.__name__}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+    def wait_until_ready(self, timeout: float | None = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.ready and self.last_error is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(0.01)
+        return self.ready
+
+    def reload(self) -> None:
+        """Load the artifact on the calling thread and publish it atomically."""
+
+        # Remember the attempt, not just successes, so the watcher retries a
+        # broken artifact as soon as it is replaced rather than every poll.
+        self._attempted_mtime = self.model_path.stat().st_mtime_ns
+        candidate = ModelService(self.model_path)
+        self.service = candidate
+        self.version += 1
+        self.last_error = None
+
+    def _initial_load(self) -> None:
+        try:
+            if not self.model_path.exists():
+                ModelTrainer(self.model_path).train_and_save()
+            self.reload()
+        except Exception as exc:  # surfaced through /ready rather than crashing the thread
+            self.last_error = repr(exc)
+        finally:
+            self._initial_attempted.set()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            if not self._initial_attempted.is_set() or not self.model_path.exists():
+                continue
+            try:
+                if self.model_path.stat().st_mtime_ns != self._attempted_mtime:
+                    self.reload()
+            except Exception as exc:  # keep serving the previous model, if any
+                self.last_error = repr(exc)
+
 
 app = FastAPI(title="ML Deployment Lesson")
-service = None
+registry = ModelRegistry(poll_interval=float(os.getenv("ML_LESSON_MODEL_POLL_SECONDS", "2.0")))
+batcher: MicroBatcher | None = None
+
+
+def _current_service() -> ModelService:
+    current = registry.service
+    if current is None:
+        raise HTTPException(status_code=503, detail="Model is still loading")
+    return current
+
+
+def _predict_with_current_service(matrix: np.ndarray) -> np.ndarray:
+    return _current_service().predict_matrix(matrix)
 
 
 @app.on_event("startup")
 def load_model() -> None:
-    global service
-    if not MODEL_PATH.exists():
-        ModelTrainer().train_and_save()
-    service = ModelService()
+    global batcher
+    registry.start()
+
+    config = BatchingConfig.from_env()
+    if config.enabled:
+        batcher = MicroBatcher(_predict_with_current_service, config.max_batch_size, config.max_wait_ms)
+        batcher.start()
+
+
+@app.on_event("shutdown")
+def stop_background_workers() -> None:
+    global batcher
+    if batcher is not None:
+        batcher.stop()
+        batcher = None
+    registry.stop()
+
+
+@app.get("/health")
+def health() -> dict[str, str]:
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready() -> dict[str, object]:
+    if not registry.ready:
+        raise HTTPException(status_code=503, detail=registry.last_error or "Model is still loading")
+    return {"ready": True, "model_version": registry.version}
 
 
 @app.post("/predict", response_model=PredictionResponse)
 def predict(request: PredictionRequest) -> PredictionResponse:
-    if service is None:
-        raise RuntimeError("Model service not initialised")
-    prediction = service.predict(request.features)
+    current = _current_service()
+    try:
+        current.check_width([request.features])
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    if batcher is not None:
+        prediction = batcher.submit(request.features)
+    else:
+        prediction = current.predict(request.features)
     return PredictionResponse(prediction=prediction)
 
 
+@app.post("/predict_batch", response_model=BatchPredictionResponse)
+def predict_batch(request: BatchPredictionRequest) -> BatchPredictionResponse:
+    try:
+        predictions = _current_service().predict_batch(request.instances)
+    except ValueError as exc:  # ragged or wrong-width rows
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return BatchPredictionResponse(predictions=predictions)
+
+
+@app.get("/metrics")
+def metrics() -> dict[str, float]:
+    counters: dict[str, float] = {"model_ready": int(registry.ready), "model_version": registry.version}
+    if batcher is None:
+        return {**counters, "micro_batching": 0}
+    return {**counters, "micro_batching": 1, **batcher.snapshot()}
+
+
 if __name__ == "__main__":
     # Demonstrate offline scoring for learners without FastAPI available.
     trainer = ModelTrainer()
@@ -90,3 +480,14 @@ if __name__ == "__main__":
     service = ModelService()
     sample = [0.03807591, 0.05068012, 0.06169621, 0.02187235, -0.0442235, -0.03482076, -0.04340085, -0.00259226, 0.01990842, -0.01764613]
     print("Sample prediction:", service.predict(sample))
+
+    # Concurrent callers share vectorised predict calls through the batcher.
+    from concurrent.futures import ThreadPoolExecutor
+
+    demo_batcher = MicroBatcher(service.predict_matrix, max_batch_size=16, max_wait_ms=5.0)
+    demo_batcher.start()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        batched = list(pool.map(demo_batcher.submit, [sample] * 32))
+    demo_batcher.stop()
+    print("Batched predictions match:", np.allclose(batched, service.predict(sample)))
+    print("Batching metrics:", demo_batcher.snapshot())
@@ -0,0 +1,110 @@
+"""Output modes for the ``ColumnTransformer`` preprocessors of lessons 03 and 06.
+
+By default a ``ColumnTransformer`` densifies its result whenever the overall
+density is above ``sparse_threshold`` (0.3), which for a few dense numeric
+columns next to a narrow one-hot block means materialising a float64 copy of
+everything. Two alternatives are offered:
+
+- ``output="sparse"`` sets ``sparse_threshold=1.0``, so one-hot and text
+  blocks stay CSR and the result is always a single CSR matrix.
+  ``transform_sparse`` additionally transforms chunk by chunk and downcasts
+  each chunk to ``float32``, so the float64 temporaries never span all rows.
+- ``transform_into`` runs the fitted branches chunk by chunk and writes each
+  block straight into a caller-provided (or freshly allocated) dense
+  ``float32`` matrix. Sparse blocks are scattered into place without a dense
+  temporary, and no full-size intermediate is ever built.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+try:
+    from lessons._lazy import lazy_import
+except ModuleNotFoundError:  # executed from inside ``lessons/``
+    from _lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from sklearn.compose import ColumnTransformer
+
+sparse = lazy_import("scipy.sparse")
+
+OUTPUT_MODES = ("default", "sparse")
+
+
+def sparse_threshold_for(output: str) -> float:
+    """``ColumnTransformer.sparse_threshold`` that implements ``output``."""
+
+    if output not in OUTPUT_MODES:
+        raise ValueError(f"Unknown output mode {output!r}; expected one of {OUTPUT_MODES}")
+    return 1.0 if output == "sparse" else 0.3
+
+
+def _write_block(target: np.ndarray, block) -> None:
+    if sparse.issparse(block):
+        block = block.tocsr()
+        target[...] = 0
+        rows = np.repeat(np.arange(block.shape[0]), np.diff(block.indptr))
+        target[rows, block.indices] = block.data
+    else:
+        target[...] = np.asarray(block).reshape(target.shape)
+
+
+def transform_sparse(
+    preprocessor: ColumnTransformer,
+    X: pd.DataFrame,
+    dtype: np.dtype = np.float32,
+    chunk_size: int = 10_000,
+) -> sparse.csr_matrix:
+    """Transform ``X`` with a fitted ``preprocessor`` into one ``dtype`` CSR matrix, a chunk at a time."""
+
+    chunks = [
+        sparse.csr_matrix(preprocessor.transform(X.iloc[start : start + chunk_size]), dtype=dtype)
+        for start in range(0, len(X), chunk_size)
+    ]
+    return sparse.vstack(chunks, format="csr")
+
+
+def transform_into(
+    preprocessor: ColumnTransformer,
+    X: pd.DataFrame,
+    out: np.ndarray | None = None,
+    dtype: np.dtype = np.float32,
+    chunk_size: int = 10_000,
+) -> np.ndarray:
+    """Transform ``X`` with a fitted ``preprocessor`` directly into a dense matrix.
+
+    Parameters
+    ----------
+    preprocessor:
+        A fitted ``ColumnTransformer``.
+    X:
+        Frame with the columns the preprocessor was fitted on.
+    out:
+        Preallocated ``(len(X), n_output_features)`` array to fill; allocated
+        with ``dtype`` when omitted.
+    chunk_size:
+        Rows transformed per step, which bounds the size of the per-branch
+        temporaries.
+    """
+
+    n_features = max(indices.stop for indices in preprocessor.output_indices_.values())
+    if out is None:
+        out = np.empty((len(X), n_features), dtype=dtype)
+    elif out.shape != (len(X), n_features):
+        raise ValueError(f"out has shape {out.shape}, expected {(len(X), n_features)}")
+
+    for start in range(0, len(X), chunk_size):
+        rows = X.iloc[start : start + chunk_size]
+        target = out[start : start + len(rows)]
+        for name, transformer, columns in preprocessor.transformers_:
+            indices = preprocessor.output_indices_[name]
+            if transformer == "drop" or indices.start == indices.stop:
+                continue
+            selected = rows[columns]
+            block = selected.to_numpy() if transformer == "passthrough" else transformer.transform(selected)
+            _write_block(target[:, indices], block)
+    return out
@@ -0,0 +1,193 @@
+"""Memoised transformer outputs shared by the preprocessing lessons.
+
+Cross-validation and grid searches over a downstream model refit and rerun
+the same preprocessing on the same folds again and again. ``CachedTransformer``
+wraps one ``ColumnTransformer`` branch and looks its results up in a
+``TransformCache`` before doing any work:
+
+- ``fit``/``fit_transform`` are keyed by the unfitted transformer's
+  parameters plus a fingerprint of the input columns (and ``y``); a hit
+  restores the fitted transformer and its training output.
+- ``transform`` is keyed by the fitted transformer's parameter version plus
+  the input fingerprint.
+
+A column fingerprint is a BLAKE2 digest of the column name, dtype and data
+buffer (object columns go through ``pd.util.hash_pandas_object`` so the
+strings, not their pointers, are hashed). Because a ``ColumnTransformer``
+hands each branch only its own columns, changing one column only
+invalidates the branches that read it.
+
+The cache is an LRU bounded by ``max_bytes``. Evicted entries are written to
+``spill_dir`` with ``joblib`` when one is given and read back on the next hit,
+otherwise they are dropped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import pickle
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin, clone
+
+
+def _column_digest(name: Any, values: pd.Series | np.ndarray) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(name).encode())
+    digest.update(str(values.dtype).encode())
+    if isinstance(values.dtype, np.dtype) and values.dtype != object:
+        digest.update(np.ascontiguousarray(values).view(np.uint8).data)
+    else:
+        digest.update(pd.util.hash_pandas_object(pd.Series(values), index=False).to_numpy().data)
+    return digest.digest()
+
+
+def fingerprint(X: Any) -> str:
+    """Digest of every column of ``X`` (DataFrame, Series, array or sparse matrix)."""
+
+    digest = hashlib.blake2b(digest_size=16)
+    if X is None:
+        digest.update(b"none")
+    elif isinstance(X, pd.DataFrame):
+        for name in X.columns:
+            digest.update(_column_digest(name, X[name]))
+    elif isinstance(X, pd.Series):
+        digest.update(_column_digest(X.name, X))
+    elif sparse.issparse(X):
+        X = X.tocsr()
+        digest.update(repr(X.shape).encode())
+        for part in (X.data, X.indices, X.indptr):
+            digest.update(_column_digest(None, part))
+    else:
+        X = np.asarray(X)
+        digest.update(repr(X.shape).encode())
+        for j, column in enumerate(X.reshape(len(X), -1).T):
+            digest.update(_column_digest(j, column))
+    return digest.hexdigest()
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if sparse.issparse(value):
+        value = value.tocsr()
+        return value.data.nbytes + value.indices.nbytes + value.indptr.nbytes
+    if isinstance(value, tuple):
+        return sum(_nbytes(item) for item in value)
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _read_only(output: Any) -> Any:
+    # Cached arrays are handed to every caller, so in-place edits must fail loudly.
+    if isinstance(output, np.ndarray):
+        output.flags.writeable = False
+    elif sparse.issparse(output):
+        for part in ("data", "indices", "indptr", "row", "col", "offsets"):
+            if isinstance(getattr(output, part, None), np.ndarray):
+                getattr(output, part).flags.writeable = False
+    elif isinstance(output, tuple):
+        for item in output:
+            _read_only(item)
+    return output
+
+
+@dataclass
+class TransformCache:
+    """Byte-bounded LRU of transformer results with optional on-disk spill."""
+
+    max_bytes: int = 256 * 2**20
+    spill_dir: Path | None = None
+    hits: int = 0
+    misses: int = 0
+    _entries: OrderedDict = field(default_factory=OrderedDict, init=False, repr=False)
+    _sizes: dict = field(default_factory=dict, init=False, repr=False)
+    _bytes: int = field(default=0, init=False, repr=False)
+
+    def __deepcopy__(self, memo: dict) -> "TransformCache":
+        # ``sklearn.base.clone`` deep-copies parameters; every clone must share one cache.
+        return self
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def _spill_path(self, key: str) -> Path:
+        return Path(self.spill_dir) / f"{key}.joblib"
+
+    def get(self, key: str) -> Any | None:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        if self.spill_dir is not None and self._spill_path(key).exists():
+            self.hits += 1
+            value = _read_only(joblib.load(self._spill_path(key)))
+            self.put(key, value)
+            return value
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        if key in self._entries:
+            self._bytes -= self._sizes.pop(key)
+            del self._entries[key]
+        size = _nbytes(value)
+        self._entries[key] = value
+        self._sizes[key] = size
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            old_key, old_value = self._entries.popitem(last=False)
+            self._bytes -= self._sizes.pop(old_key)
+            if self.spill_dir is not None and not self._spill_path(old_key).exists():
+                Path(self.spill_dir).mkdir(parents=True, exist_ok=True)
+                joblib.dump(old_value, self._spill_path(old_key))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._sizes.clear()
+        self._bytes = 0
+
+
+class CachedTransformer(BaseEstimator, TransformerMixin):
+    """Wrap ``transformer`` so repeated fits and transforms on identical columns are free."""
+
+    def __init__(self, transformer: BaseEstimator, cache: TransformCache):
+        self.transformer = transformer
+        self.cache = cache
+
+    def _fit_key(self, X: Any, y: Iterable | None) -> str:
+        return "fit-" + joblib.hash((self.transformer, fingerprint(X), fingerprint(y)))
+
+    def fit_transform(self, X: Any, y: Iterable | None = None, **fit_params):
+        key = self._fit_key(X, y) if not fit_params else None
+        cached = self.cache.get(key) if key else None
+        if cached is None:
+            transformer = clone(self.transformer)
+            output = transformer.fit_transform(X, y, **fit_params)
+            cached = (transformer, joblib.hash(transformer), _read_only(output))
+            if key:
+                self.cache.put(key, cached)
+        self.transformer_, self.version_, output = cached
+        return output
+
+    def fit(self, X: Any, y: Iterable | None = None, **fit_params):
+        self.fit_transform(X, y, **fit_params)
+        return self
+
+    def transform(self, X: Any):
+        key = f"transform-{self.version_}-{fingerprint(X)}"
+        output = self.cache.get(key)
+        if output is None:
+            output = _read_only(self.transformer_.transform(X))
+            self.cache.put(key, output)
+        return output
+
+    def get_feature_names_out(self, input_features=None):
+        return self.transformer_.get_feature_names_out(input_features)
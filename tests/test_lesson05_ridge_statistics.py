@@ -0,0 +1,59 @@
+"""Sufficient-statistics ridge CV and learning curves against scikit-learn."""
+
+import numpy as np
+import pytest
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import KFold, cross_validate, learning_curve
+
+from lessons.lesson05_model_evaluation import RidgeStatistics, ridge_cross_validation, ridge_learning_curve
+
+
+def _offset_regression(offset: float, n_samples: int = 400, n_features: int = 5):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(n_samples, n_features))
+    y = X @ rng.normal(size=n_features) + rng.normal(scale=1e-3, size=n_samples) + offset
+    return X, y
+
+
+@pytest.mark.parametrize("offset", [0.0, 1e4, 1e6])
+def test_cross_validation_matches_ridge_on_offset_targets(offset):
+    X, y = _offset_regression(offset)
+    cv = KFold(n_splits=5, shuffle=True, random_state=42)
+    expected = -cross_validate(Ridge(alpha=1.0), X, y, cv=cv, scoring="neg_root_mean_squared_error")["test_score"]
+
+    result = ridge_cross_validation(X, y, alphas=[1.0], cv=cv)
+
+    np.testing.assert_allclose(result["rmse"], expected, rtol=1e-6)
+
+
+@pytest.mark.parametrize("offset", [0.0, 1e4, 1e6])
+def test_learning_curve_matches_ridge_on_offset_targets(offset):
+    X, y = _offset_regression(offset)
+    sizes, train_scores, validation_scores = learning_curve(
+        Ridge(alpha=1.0),
+        X,
+        y,
+        cv=5,
+        scoring="neg_root_mean_squared_error",
+        train_sizes=np.linspace(0.1, 1.0, 5),
+        shuffle=True,
+        random_state=42,
+    )
+
+    curve = ridge_learning_curve(X, y)
+
+    np.testing.assert_array_equal(curve["train_size"], sizes)
+    np.testing.assert_allclose(curve["train_rmse"], -train_scores.mean(axis=1), rtol=1e-6)
+    np.testing.assert_allclose(curve["validation_rmse"], -validation_scores.mean(axis=1), rtol=1e-6)
+
+
+def test_merged_statistics_match_statistics_of_all_rows():
+    X, y = _offset_regression(1e6)
+    whole = RidgeStatistics.from_rows(X, y)
+    head, tail = RidgeStatistics.from_rows(X[:150], y[:150]), RidgeStatistics.from_rows(X[150:], y[150:])
+
+    merged, remainder = head + tail, whole - head
+    np.testing.assert_allclose(merged.xx, whole.xx)
+    np.testing.assert_allclose(merged.yy, whole.yy)
+    np.testing.assert_allclose(remainder.xy, tail.xy, atol=1e-9)
+    np.testing.assert_allclose(remainder.y_mean, tail.y_mean)
@@ -0,0 +1,34 @@
+"""float32/float64 parity of the lesson08 networks."""
+
+import numpy as np
+import pytest
+
+from lessons.lesson08_deep_learning import SimpleNeuralNetwork, compare_precision, generate_sine_wave_data
+
+
+def test_float32_training_tracks_float64():
+    losses = compare_precision(n_samples=256, epochs=200, seed=0)
+
+    assert losses["float32"] == pytest.approx(losses["float64"], abs=1e-3)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_parameters_keep_configured_dtype(dtype):
+    np.random.seed(0)
+    X, y = generate_sine_wave_data(128)
+    network = SimpleNeuralNetwork(input_dim=1, hidden_dim=16, output_dim=1, dtype=dtype)
+    for _ in range(5):
+        network.train_step(X, y)
+
+    for layer in (network.layer1, network.layer2):
+        assert layer.weights.dtype == dtype
+        assert layer.bias.dtype == dtype
+
+
+def test_predict_keeps_float32_inputs_float32():
+    np.random.seed(0)
+    X, y = generate_sine_wave_data(128)
+    network = SimpleNeuralNetwork(input_dim=1, hidden_dim=16, output_dim=1)
+    network.train_step(X, y)
+
+    assert network.predict(X.astype(np.float32)).dtype == np.float32